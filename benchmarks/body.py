@@ -0,0 +1,68 @@
+import io
+import timeit
+import tracemalloc
+from collections.abc import Iterable
+
+from framework.service.http import header, Http, Route
+
+
+def sliced(body: bytes, buffer_size: int):
+    for i in range(0, len(body), buffer_size):
+        yield body[i:i + buffer_size]
+
+
+def single(body: bytes):
+    if body:
+        yield body
+
+
+def start_response(*args):
+    pass
+
+
+def copied(chunks: Iterable[bytes], body: bytes):
+    return sum(len(chunk) for chunk in chunks if chunk is not body)
+
+
+def allocated(call):
+    tracemalloc.start()
+
+    try:
+        call()
+
+        return tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+
+def body(sizes: tuple[int, ...] = (1024, 102400, 10485760)):
+    setattr(Http, 'encoding', 'utf-8')
+    setattr(Http, 'buffer_size', io.DEFAULT_BUFFER_SIZE)
+
+    for attr in (
+            'simple', 'cookie'
+    ):
+        setattr(header, attr, dict())
+
+    for size in sizes:
+        data, number = b'x' * size, max(5, 20000000 // size)
+
+        for case, chunks in (
+                ('sliced', lambda: sliced(data, io.DEFAULT_BUFFER_SIZE)),
+                ('single', lambda: single(data)),
+                ('route', lambda: Route(data)(start_response)),
+        ):
+            def call():
+                return sum(map(len, chunks()))
+
+            seconds = min(timeit.repeat(call, number=number, repeat=5)) / number
+
+            yield size, case, size / seconds / 2 ** 20, copied(chunks(), data), allocated(call)
+
+
+if __name__ == '__main__':
+    print('%9s  %-6s  %12s  %10s  %10s' % ('bytes', 'case', 'MiB/s', 'copied', 'peak'))
+
+    for size, case, throughput, copies, peak in body():
+        print('%9d  %-6s  %12.1f  %10d  %10d' % (size, case, throughput, copies, peak))
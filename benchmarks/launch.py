@@ -0,0 +1,237 @@
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+
+import framework
+from framework.http import cookie, file, query, set_cookie, url_for
+from framework.routing import Rule, Endpoint, Map, Path
+from framework.service import Service
+from framework.utils.alias import WSGIEnvironment, WSGIApplication
+
+bodies = {size: b'x' * size for size in (1024, 102400, 1048576)}
+
+
+def bench_page(path: Path):
+    return path['name']
+
+
+def bench_token(path: Path):
+    return str(path['pk'])
+
+
+def bench_parse():
+    return f"{query('page')}:{query('sort')}:{cookie('session')}"
+
+
+def bench_cookie():
+    for i in range(4):
+        set_cookie(f"c{i}", 'value', path='/', max_age=3600, httponly=True, samesite='lax')
+
+    return b''
+
+
+def bench_body(path: Path):
+    return bodies[int(path['size'])]
+
+
+def bench_url_for():
+    return url_for('token-1', pk='42', slug='slug')
+
+
+def start_response(*args):
+    return None
+
+
+def environ(path_info: str, query_string: str = '', **kwargs: str) -> WSGIEnvironment:
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path_info,
+        'QUERY_STRING': query_string,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.input': io.BytesIO(),
+        **kwargs,
+    }
+
+
+def routes(size: int):
+    rules = list()
+
+    for i in range(size):
+        if 0 == i % 2:
+            rules.extend((Rule(f"/section-{i}/status", f"literal-{i}"), Endpoint(f"literal-{i}", bench_page, Path({'name': 'ok'}))))
+
+        else:
+            rules.extend((Rule(f"/section-{i}/<int:pk>/<slug>", f"token-{i}"), Endpoint(f"token-{i}", bench_token)))
+
+    return rules
+
+
+def cases(directory: str, radix: bool) -> Iterator[tuple[str, WSGIApplication, WSGIEnvironment]]:
+    for size in (10, 100, 1000):
+        app = Service(Map(tuple(routes(size))), radix=radix)
+        last = size - 1
+
+        yield f"routing/{size}/literal", app, environ(f"/section-{size - 2}/status")
+        yield f"routing/{size}/token", app, environ(f"/section-{last}/42/slug")
+        yield f"routing/{size}/miss", app, environ('/missing/42/slug')
+
+    for size in (65536, 1048576):
+        with open(filepath := os.path.join(directory, f"{size}.bin"), 'wb') as f:
+            f.write(os.urandom(size))
+
+    urlmap = Map((
+        *routes(2),
+        Rule('/parse', 'parse'),
+        Endpoint('parse', bench_parse),
+        Rule('/cookie', 'cookie'),
+        Endpoint('cookie', bench_cookie),
+        Rule('/body/<size>', 'body'),
+        Endpoint('body', bench_body),
+        Rule('/file/<name>', 'file', {'name': (0, r'[0-9.a-z]+')}),
+        Endpoint('file', bench_file_path, directory),
+        Rule('/url_for', 'url_for'),
+        Endpoint('url_for', bench_url_for),
+    ))
+
+    app = Service(urlmap, radix=radix, url_cache=256)
+
+    yield 'parse/query_cookie', app, environ(
+        '/parse', 'page=2&sort=name%20asc&filter=a', HTTP_COOKIE='session=abc123; theme=dark; lang=en'
+    )
+    yield 'cookie/build', app, environ('/cookie')
+
+    for size in bodies.keys():
+        yield f"route/{size}", app, environ(f"/body/{size}")
+
+    for size in (65536, 1048576):
+        yield f"file/{size}", app, environ(f"/file/{size}.bin")
+
+    yield 'url_for/cached', app, environ('/url_for')
+    yield 'url_for/uncached', Service(urlmap, radix=radix), environ('/url_for')
+
+
+def bench_file_path(directory: str, path: Path):
+    return file(os.path.join(directory, path['name']))
+
+
+def request(app: WSGIApplication, env: WSGIEnvironment):
+    body = app(dict(env), start_response)
+
+    try:
+        for _ in body:
+            pass
+
+    finally:
+        if (close := getattr(body, 'close', None)) is not None:
+            close()
+
+
+def measure(app: WSGIApplication, env: WSGIEnvironment, seconds: float, allocations: int) -> dict[str, Any]:
+    for _ in range(10):
+        request(app, env)
+
+    samples, deadline = list(), time.perf_counter() + seconds
+
+    while (start := time.perf_counter()) < deadline or len(samples) < 20:
+        request(app, env)
+
+        samples.append(time.perf_counter() - start)
+
+    peaks = list()
+
+    tracemalloc.start()
+
+    try:
+        for _ in range(allocations):
+            current = tracemalloc.get_traced_memory()[0]
+
+            tracemalloc.reset_peak()
+
+            request(app, env)
+
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+
+    return {
+        'requests': len(samples),
+        'ops': len(samples) / sum(samples),
+        'p50': samples[len(samples) // 2] * 1e6,
+        'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+        'alloc': statistics.median(peaks),
+    }
+
+
+def compare(results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]]):
+    for name, result in results.items():
+        if (previous := baseline.get(name)) is not None:
+            result['change'] = result['ops'] / previous['ops'] - 1
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.launch')
+    parser.add_argument('--seconds', type=float, default=0.5, help='measurement time per case')
+    parser.add_argument('--allocations', type=int, default=50, help='requests traced for allocations per case')
+    parser.add_argument('--filter', default='', help='run only cases whose name contains this text')
+    parser.add_argument('--radix', action='store_true', help='use the segment tree router')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='JSON file from a previous run to compare ops/sec against')
+    args = parser.parse_args(argv)
+
+    directory, results = tempfile.mkdtemp(), dict()
+
+    try:
+        print('%-24s  %10s  %10s  %10s  %10s  %8s' % ('case', 'ops/sec', 'p50 us', 'p99 us', 'alloc B', 'change'))
+
+        baseline = dict()
+
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)['results']
+
+        for name, app, env in cases(directory, args.radix):
+            if args.filter not in name:
+                continue
+
+            results[name] = result = measure(app, env, args.seconds, args.allocations)
+
+            compare({name: result}, baseline)
+
+            print('%-24s  %10.0f  %10.1f  %10.1f  %10d  %8s' % (
+                name, result['ops'], result['p50'], result['p99'], result['alloc'],
+                f"{result['change']:+.1%}" if 'change' in result else '',
+            ))
+
+    finally:
+        shutil.rmtree(directory)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'version': '.'.join(map(str, framework.Framework.version)),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'radix': args.radix,
+                'results': results,
+            }, f, indent=2)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
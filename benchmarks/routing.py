@@ -0,0 +1,53 @@
+import re
+import timeit
+
+from framework.routing import Rule, Map
+from framework.routing.urlmap import Link, Mapped, Radix
+
+
+def urlmap(size: int):
+    return Map(tuple(
+        Rule(f"/section-{i}/status", f"literal-{i}") if 0 == i % 2 else
+        Rule(f"/section-{i}/<int:pk>/<slug>", f"token-{i}")
+        for i in range(size)
+    ))
+
+
+def findall(mapped: Mapped, environ: dict[str, str]):
+    for pattern, (link, types) in mapped.items():
+        if re.findall(pattern, environ['PATH_INFO']):
+            return link
+
+
+def measure(call, number: int, repeat: int = 5):
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number * 1e6
+
+
+def routing(sizes: tuple[int, ...] = (10, 100, 1000, 10000)):
+    for size in sizes:
+        m, number = urlmap(size), max(10, 100000 // size)
+        mapped, radix, link = Mapped(m), Radix(m), Link(m)
+
+        last = size - 1 if 1 == (size - 1) % 2 else size - 2
+
+        for case, environ in (
+                ('literal', dict(PATH_INFO=f"/section-{size - 2}/status")),
+                ('token', dict(PATH_INFO=f"/section-{last}/42/slug")),
+                ('miss', dict(PATH_INFO='/missing/42/slug')),
+        ):
+            yield size, case, {
+                'findall': measure(lambda: findall(mapped, environ), max(1, 1000 // size), 3),
+                'mapped': measure(lambda: mapped.parse(environ), number * 10),
+                'radix': measure(lambda: radix.parse(environ), number * 10),
+            }
+
+        yield size, 'url_for', {
+            'collect': measure(lambda: link.collect((f"token-{last}",), {'pk': '42', 'slug': 'slug'}), number * 10),
+        }
+
+
+if __name__ == '__main__':
+    print('%6s  %-8s  %s' % ('routes', 'case', 'us per call'))
+
+    for size, case, result in routing():
+        print('%6d  %-8s  %s' % (size, case, '  '.join(f"{k}={v:.3f}" for k, v in result.items())))
@@ -1,4 +1,5 @@
 from .service import Service
+from .service.asgi import AsyncService
 
 
 class Framework(Service):
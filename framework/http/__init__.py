@@ -1,7 +1,7 @@
-from .request import env, query, cookie
+from .request import env, query, cookie, body, form
 
 from .response import url_file, url_for
-from .response import file
+from .response import file, stream, stream_json
 from .response import redirect
 from .response import set_header, get_header, has_header, delete_header
 from .response import set_cookie, delete_cookie
@@ -11,3 +11,11 @@ def query(name: str):
 
 def cookie(name: str):
     return http.call.cookie.get(name)
+
+
+def body():
+    return http.call.body
+
+
+def form():
+    return http.call.form
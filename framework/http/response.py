@@ -1,10 +1,12 @@
 import os
+from collections.abc import Iterable
 from datetime import datetime, timedelta
-from typing import Literal
+from typing import Any, Literal
 
 from ..service import static
-from ..service.http import header, File
+from ..service.http import header, File, Stream
 from ..service.http.header import format_expires, Cookie
+from ..utils.serialize import array
 
 
 def url_file(name: str):
@@ -16,12 +18,26 @@ def url_for(*args: str, **kwargs: str):
 
 
 def file(filepath: str | os.PathLike):
-    if os.path.isfile(filepath):
-        return File(filepath)
+    if (stat := static.lookup(filepath)) is not None:
+        return File(filepath, stat)
 
     return b'File not found', 404
 
 
+def stream(
+        chunks: Iterable[bytes | str],
+        code: int = None,
+        mimetype: str = None,
+        encoding: str = None,
+        length: int = None,
+):
+    return Stream(chunks, code, None, mimetype, encoding, length)
+
+
+def stream_json(items: Iterable[Any], code: int = None):
+    return Stream(array(items), code, None, 'application/json')
+
+
 def redirect(urlpath: str, status_code: int = 307):
     header.simple['location'] = urlpath
 
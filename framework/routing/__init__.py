@@ -2,6 +2,10 @@ import re
 from collections.abc import Callable
 
 
+def plain(path: str):
+    return re.search(r'[.^$*+?{}\[\]\\|()<>]', path) is None
+
+
 class Rule(object):
     __slots__ = ('path', 'link', 'patterns')
 
@@ -14,10 +18,31 @@ class Rule(object):
             setattr(self, attr, value)
 
 
-class Endpoint(object):
-    __slots__ = ('link', 'module', 'name', 'method', 'args')
+class Cache(object):
+    __slots__ = ('ttl', 'size', 'query')
+
+    def __init__(self, ttl: int | float, size: int = 128, query: tuple[str, ...] = ()):
+        if 0 >= ttl:
+            raise ValueError("URL Map. Cache. TTL must be a positive number: '%s'." % ttl)
 
-    def __init__(self, link: str, endpoint: Callable | tuple[Callable] | tuple[Callable, str], *args):
+        for attr, value in (
+                ('ttl', ttl),
+                ('size', size),
+                ('query', query),
+        ):
+            setattr(self, attr, value)
+
+
+class Endpoint(object):
+    __slots__ = ('link', 'module', 'name', 'method', 'args', 'cache')
+
+    def __init__(
+            self,
+            link: str,
+            endpoint: Callable | tuple[Callable] | tuple[Callable, str],
+            *args,
+            cache: Cache = None,
+    ):
         if isinstance(obj := endpoint, tuple):
             obj, method = obj[0], obj[1] if 2 == len(obj) else '__call__'
 
@@ -30,18 +55,19 @@ class Endpoint(object):
                 ('name', obj.__name__),
                 ('method', method),
                 ('args', args),
+                ('cache', cache),
         ):
             setattr(self, attr, value)
 
 
 class Map(object):
-    __slots__ = ('link', 'mapped', 'callback')
+    __slots__ = ('link', 'mapped', 'token', 'literal', 'callback', 'cache')
 
     def __init__(self, rules: tuple[Rule | Endpoint, ...]):
         def generator():
             return (getattr(line, a) for a in line.__slots__)
 
-        for attr in ('link', 'mapped', 'callback'):
+        for attr in ('link', 'mapped', 'token', 'literal', 'callback', 'cache'):
             setattr(self, attr, dict())
 
         for line in rules:
@@ -50,13 +76,16 @@ class Map(object):
                     self.rule(*generator())
 
                 case 'Endpoint':
-                    link, module, name, method, args = generator()
+                    link, module, name, method, args, cache = generator()
 
                     if link in self.callback.keys():
                         raise ValueError("URL Map. Endpoint. Link already exists in endpoint list: '%s'." % link)
 
                     self.callback[link] = module, name, method, args
 
+                    if cache is not None:
+                        self.cache[link] = cache
+
     def rule(self, path: str, link: str, patterns: dict[str, str]):
         def msg(message: str, *args):
             if args:
@@ -70,7 +99,7 @@ class Map(object):
         if not path.startswith('/'):
             raise msg("Path must start slash: '%s'", path)
 
-        raw_path, pattern, keys, types = path, f"^{path}$", tuple(), tuple()
+        raw_path, pattern, keys, types, values = path, f"^{path}$", tuple(), tuple(), dict()
 
         for key in re.findall(r'<([A-Za-z0-9:_,()]+)>', path):
             if 1 < len(s := str(key).split(':', 1)):
@@ -120,6 +149,7 @@ class Map(object):
 
             keys = (*keys, key)
             types = (*types, (flag, key))
+            values[key] = value
 
         if {} != patterns:
             raise msg('Patterns added to rules have unused values: %s', patterns)
@@ -134,6 +164,10 @@ class Map(object):
             self.link[link] = ((pattern, path, keys),)
 
         self.mapped[pattern] = link, types
+        self.token[pattern] = path, values
+
+        if plain(path):
+            self.literal[path] = link
 
 
 class Path(object):
@@ -150,3 +184,6 @@ class Path(object):
 
     def get(self, key: str):
         return self.__token.get(key)
+
+    def items(self):
+        return self.__token.items()
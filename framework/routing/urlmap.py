@@ -1,67 +1,272 @@
 import re
 from typing import Any
 
-from . import Map, Path
+from . import plain, Map, Path
 from ..utils.alias import WSGIEnvironment
+from ..utils.lru import LRU
+
+missing = object()
+
+
+def template(path: str, keys: tuple[str, ...]):
+    path = path.replace('{', '{{').replace('}', '}}')
+
+    for key in keys:
+        path = path.replace(f"<{key}>", f"{{{key}}}")
+
+    return path
 
 
 class Link(dict[str, tuple[tuple[str, str, tuple[str, ...]], ...]]):
-    def __init__(self, urlmap: Map):
+    def __init__(self, urlmap: Map, cache: int = 0):
         dict.__init__(self)
         dict.update(self, urlmap.link)
 
+        self.template, self.cache = dict(), LRU(cache) if 0 < cache else None
+
+        for link, items in self.items():
+            self.template[link] = dict()
+
+            for pattern, path, keys in items:
+                validators = tuple((key, re.compile(value)) for key, value in urlmap.token[pattern][1].items())
+                check = None if plain(re.sub(r'<[A-Za-z0-9_]+>', '', path)) else re.compile(pattern)
+
+                self.template[link].setdefault(frozenset(keys), list()).append((template(path, keys), validators, check))
+
     def collect(self, args: tuple[str, ...], kwargs: dict[str, str]):
-        def query():
-            return f"?{'&'.join(args[1:])}" if 1 < len(args) else ''
+        if self.cache is None:
+            return self.build(args, kwargs)
+
+        if (url := self.cache.get(key := (args, frozenset(kwargs.items())), missing)) is missing:
+            self.cache.set(key, url := self.build(args, kwargs))
+
+        return url
+
+    def build(self, args: tuple[str, ...], kwargs: dict[str, str]):
+        if (templates := self.template.get(args[0])) is not None:
+            for path, validators, check in templates.get(frozenset(kwargs), ()):
+                for key, pattern in validators:
+                    if pattern.fullmatch(kwargs[key]) is None:
+                        break
+
+                else:
+                    url = path.format_map(kwargs)
+
+                    if check is None or check.match(url) is not None:
+                        return f"{url}?{'&'.join(args[1:])}" if 1 < len(args) else url
+
+
+def tokens(types: tuple[tuple[int, str], ...], values: tuple[str, ...]):
+    tokens = dict()
+
+    for (flag, key), value in zip(types, values):
+        match flag:
+            case 0:
+                tokens[key] = value
+
+            case 1:
+                tokens[key] = int(value)
+
+            case 2:
+                tokens[key] = float(value)
 
-        if args[0] in self.keys():
-            for pattern, path, keys in self[args[0]]:
-                if (i := len(kwargs)) == len(keys):
-                    if 0 < i:
-                        for key in keys:
-                            try:
-                                path = path.replace(f"<{key}>", kwargs[key])
+    return tokens
 
-                                if hasattr(r := re.match(pattern, path), 'string'):
-                                    return f"{r.string}{query()}"
 
-                            except KeyError:
-                                pass
-                    else:
-                        return f"{path}{query()}"
+def bucket(path: str):
+    if (r := re.search(r'[.^$*+?{}\[\]\\|()<>]', path)) is None:
+        return path[1:].split('/', 1)[0]
+
+    if '|' not in path and '/' in (head := path[1:r.start() - (r[0] in '*+?{')]):
+        return head.split('/', 1)[0]
+
+
+def numbered(pattern: str):
+    return re.search(r'\\[1-9]|\(\?\(\d', re.sub(r'\\\\', '', pattern)) is not None
+
+
+def alternation(rules: list[tuple[int, str, tuple[str, tuple[tuple[int, str], ...]]]]):
+    if 1 == len(rules) and numbered(rules[0][1]):
+        (n, pattern, (link, types)), = rules
+
+        return (regex := re.compile(pattern)), {None: (n, link, types, 0, regex.groups)}
+
+    branch, i = dict(), 1
+
+    for n, pattern, (link, types) in rules:
+        branch[i] = n, link, types, i, (count := re.compile(pattern).groups)
+
+        i += 1 + count
+
+    return re.compile('|'.join(f"({pattern})" for _, pattern, _ in rules)), branch
 
 
 class Mapped(dict[str, tuple[str, tuple[tuple[int, str], ...]]]):
+    def __init__(self, urlmap: Map, patterns: tuple[str, ...] = None):
+        dict.__init__(self)
+        dict.update(self, urlmap.mapped if patterns is None else {p: urlmap.mapped[p] for p in patterns})
+
+        self.prefix, self.literal, group, order = dict(), dict(), dict(), dict()
+
+        for n, pattern in enumerate(urlmap.mapped.keys()):
+            if pattern in self.keys():
+                group.setdefault(bucket(urlmap.token[pattern][0]), list()).append((n, pattern, self[pattern]))
+                order[pattern] = n
+
+        for key, rules in group.items():
+            chunks, names = [[]], set()
+
+            for rule in rules:
+                if numbered(rule[1]):
+                    chunks.extend(([rule], []))
+                    names.clear()
+
+                    continue
+
+                if names & (index := re.compile(rule[1]).groupindex.keys()):
+                    chunks.append([])
+                    names.clear()
+
+                chunks[-1].append(rule)
+                names.update(index)
+
+            self.prefix[key] = tuple(alternation(chunk) for chunk in chunks if chunk)
+
+        for path, link in urlmap.literal.items():
+            if (pattern := f"^{path}$") in order.keys() and self.match(path)[0] == order[pattern]:
+                self.literal[path] = link
+
+    def match(self, path_info: str):
+        if (key := path_info[1:].split('/', 1)[0]).endswith('\n'):
+            key = key[:-1]
+
+        found = None
+
+        for key in (key, None):
+            for regex, branch in self.prefix.get(key, ()):
+                if r := regex.match(path_info):
+                    n, link, types, i, count = branch[None if None in branch else r.lastindex]
+
+                    if found is None or n < found[0]:
+                        found = n, link, types, r.groups()[i:i + count] if 0 < count else (r[i],)
+
+        return found
+
+    def parse(self, environ: WSGIEnvironment):
+        link, kwargs = None, dict()
+
+        if not self or (link := self.literal.get(path_info := environ['PATH_INFO'])) is not None:
+            return link, kwargs
+
+        if r := self.match(path_info):
+            _, link, types, values = r
+
+            if values.__len__() == types.__len__():
+                kwargs['path'] = Path(tokens(types, values))
+
+        return link, kwargs
+
+
+def crosses(pattern: str):
+    if '/' in pattern or re.search(r'\\[DWSxuUN0-7]', pattern) or re.search(r'\.|\[\^', re.sub(r'\\.', '', pattern)):
+        return True
+
+    for chars in re.findall(r'\[((?:\\.|[^\]])*)]', pattern):
+        for low, high in re.findall(r'(.)-(.)', re.sub(r'\\(.)', r'\1', chars)):
+            if low <= '/' <= high:
+                return True
+
+    return False
+
+
+class Node(object):
+    __slots__ = ('static', 'dynamic', 'leaf')
+
+    def __init__(self):
+        self.static, self.dynamic, self.leaf = dict(), dict(), None
+
+    def insert(self, segments: list[str], token: dict[str, str]):
+        node = self
+
+        for segment in segments:
+            if keys := re.findall(r'<([A-Za-z0-9_]+)>', segment):
+                for key in keys:
+                    segment = segment.replace(f"<{key}>", f"({token[key]})")
+
+            elif plain(segment):
+                node = node.static.setdefault(segment, Node())
+
+                continue
+
+            if segment not in node.dynamic.keys():
+                node.dynamic[segment] = re.compile(segment), Node()
+
+            node = node.dynamic[segment][1]
+
+        return node
+
+    def search(self, segments: list[str], i: int, values: tuple[str, ...]):
+        if i == segments.__len__():
+            return None if self.leaf is None else (self.leaf, values)
+
+        if (node := self.static.get(segments[i])) is not None:
+            if r := node.search(segments, i + 1, values):
+                return r
+
+        for pattern, node in self.dynamic.values():
+            if m := pattern.fullmatch(segments[i]):
+                if r := node.search(segments, i + 1, (*values, *m.groups())):
+                    return r
+
+
+class Radix(dict[str, tuple[str, tuple[tuple[int, str], ...]]]):
     def __init__(self, urlmap: Map):
         dict.__init__(self)
         dict.update(self, urlmap.mapped)
 
+        self.root, self.literal, fallback, order = Node(), dict(), tuple(), dict()
+
+        for n, (pattern, items) in enumerate(self.items()):
+            path, token = urlmap.token[pattern]
+            order[pattern] = n
+
+            if (
+                    not plain(re.sub(r'<[A-Za-z0-9_]+>', '', path)) or
+                    any(crosses(value) for value in token.values())
+            ):
+                fallback = (*fallback, pattern)
+
+            elif (node := self.root.insert(path.split('/')[1:], token)).leaf is None:
+                node.leaf = n, items
+
+        self.fallback = Mapped(urlmap, fallback) if fallback else None
+
+        for path, link in urlmap.literal.items():
+            if self.fallback is None or (r := self.fallback.match(path)) is None or order[f"^{path}$"] < r[0]:
+                self.literal[path] = link
+
     def parse(self, environ: WSGIEnvironment):
         link, kwargs = None, dict()
 
-        for pattern, items in self.items():
-            if values := re.findall(pattern, environ['PATH_INFO']):
-                (link, types), values = items, v if isinstance((v := values[0]), tuple) else (v,)
-
-                if 0 < values.__len__() == types.__len__():
-                    tokens, i = dict(), 0
+        if not self or (link := self.literal.get(path_info := environ['PATH_INFO'])) is not None:
+            return link, kwargs
 
-                    for flag, key in types:
-                        match flag:
-                            case 0:
-                                tokens[key] = values[i]
+        found = self.root.search(path_info.split('/')[1:], 0, ())
 
-                            case 1:
-                                tokens[key] = int(values[i])
+        if self.fallback is not None and (r := self.fallback.match(path_info)) is not None:
+            if found is None or r[0] < found[0][0]:
+                _, link, types, values = r
 
-                            case 2:
-                                tokens[key] = float(values[i])
+                if values.__len__() == types.__len__():
+                    kwargs['path'] = Path(tokens(types, values))
 
-                        i += 1
+                return link, kwargs
 
-                    kwargs['path'] = Path(tokens)
+        if found:
+            (_, (link, types)), values = found
 
-                break
+            if 0 < values.__len__() == types.__len__():
+                kwargs['path'] = Path(tokens(types, values))
 
         return link, kwargs
 
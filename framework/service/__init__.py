@@ -1,15 +1,22 @@
 import io
 import os
+import time
 from collections.abc import Callable, Iterable
+from contextvars import Token
 from datetime import datetime, timezone
+from typing import Any
 
-from .http import header, Http, File, Routing
-from .http.parse import EnvironParse
-from .static import valid
+from .http import header, Http, File, Route, Routing, Stream
+from .http.parse import Body, EnvironParse, Form
+from .static import valid, Memory
 from ..routing import Map
-from ..routing.urlmap import Link, Mapped
+from ..routing.urlmap import Link, Mapped, Radix
 from ..utils import utc
 from ..utils.alias import StartResponse, WSGIEnvironment, WSGIApplication
+from ..utils.context import restore, Closing
+from ..utils.lru import LRU
+from ..utils.metrics import Measure, Measured, Metrics
+from ..utils.serialize import array
 
 
 def recompile(not_found: Callable | tuple[Callable] | tuple[Callable, str] | None):
@@ -24,24 +31,49 @@ def recompile(not_found: Callable | tuple[Callable] | tuple[Callable, str] | Non
 
 
 class Service(Routing):
-    __slots__ = ('mapped',)
+    __slots__ = ('mapped', 'metrics')
 
     def __init__(
             self: WSGIApplication,
             urlmap: Map = None,
             not_found: Callable | tuple[Callable] | tuple[Callable, str] = None,
             static_urlpath: str = None,
+            radix: bool = False,
+            url_cache: int = 0,
+            eager: bool = False,
+            singleton: bool = False,
+            file_buffer_size: int = 65536,
+            sendfile: str = None,
+            etag: bool = False,
+            static_cache: int = 1024,
+            static_interval: float = 1.0,
+            static_memory: int = 0,
+            static_preload: int = 262144,
+            compress: bool = False,
+            compress_level: int = 6,
+            compress_size: int = 1024,
+            compress_cache: int = 128,
+            compress_cache_body: int = 65536,
+            max_body_size: int = None,
+            form_spool: int = 1048576,
+            form_part_size: int = None,
+            form_size: int = None,
+            metrics: Metrics | bool = False,
     ):
         if urlmap is None:
             urlmap = Map(())
 
-        self.mapped = Mapped(urlmap)
+        self.mapped = (Radix if radix else Mapped)(urlmap)
+        self.metrics = (Metrics() if metrics is True else metrics) or None
 
-        super().__init__(urlmap, recompile(not_found))
+        super().__init__(urlmap, recompile(not_found), eager, singleton)
 
         for attr, value in (
                 ('urlpath', valid(static_urlpath)),
-                ('link', Link(urlmap)),
+                ('link', Link(urlmap, url_cache)),
+                ('files', LRU(static_cache) if 0 < static_cache else None),
+                ('interval', static_interval),
+                ('memory', Memory(static_memory, static_preload) if 0 < static_memory else None),
         ):
             setattr(static, attr, value)
 
@@ -51,30 +83,110 @@ class Service(Routing):
         ):
             setattr(Http, attr, value)
 
-    def __call__(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
         for attr, value in (
-                ('now', dt := datetime.now(tz=timezone.utc)),
-                ('timestamp', dt.timestamp()),
+                ('buffer_size', file_buffer_size),
+                ('socket', sendfile),
+                ('precompressed', staticmethod(static.lookup) if compress else None),
         ):
-            setattr(utc, attr, value)
+            setattr(File, attr, value)
 
         for attr, value in (
-                ('call', EnvironParse(environ)),
-                ('environ', environ),
+                ('checksum', etag),
+                ('compress', compress),
+                ('level', compress_level),
+                ('threshold', compress_size),
+                ('compressed', LRU(compress_cache) if compress and 0 < compress_cache else None),
+                ('cacheable', compress_cache_body),
         ):
-            setattr(http, attr, value)
+            setattr(Route, attr, value)
+
+        setattr(Body, 'limit', max_body_size)
 
-        for attr in (
-                'simple', 'cookie'
+        for attr, value in (
+                ('spool', form_spool),
+                ('part_limit', form_part_size),
+                ('limit', form_size),
         ):
-            setattr(header, attr, dict())
+            setattr(Form, attr, value)
+
+    def __call__(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
+        tokens = self.context(environ)
+
+        try:
+            if self.metrics is not None:
+                chunks = self.measured(environ, start_response)
+
+            elif (link := (r := self.mapped.parse(environ))[0]) is None:
+                chunks = self.error(404)(start_response)
+
+            else:
+                chunks = self.response(link, r[1])(start_response)
+
+        except BaseException:
+            restore(tokens)
+
+            raise
+
+        return self.release(environ, chunks, tokens)
+
+    def measured(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
+        def start(status: str, headers: list[tuple[str, str]], *exc_info):
+            nonlocal length
+
+            measure.status = status[:3]
+            length = next((value for name, value in headers if 'content-length' == name.lower()), None)
+
+            return start_response(status, headers, *exc_info)
+
+        measure, length = Measure(), None
 
-        link, kwargs = self.mapped.parse(environ)
+        measure.link, kwargs = self.mapped.parse(environ)
+        measure.routed = time.perf_counter()
 
-        if link is None:
-            return self.error(404)(start_response)
+        response = self.error(404) if measure.link is None else self.response(measure.link, kwargs)
 
-        return self.response(link, kwargs)(start_response)
+        measure.handled = time.perf_counter()
+
+        if not self.unwrapped(environ, chunks := response(start)):
+            return Measured(chunks, self.metrics, measure)
+
+        if isinstance(chunks, (list, tuple)) and chunks:
+            measure.size = sum(map(len, chunks))
+
+        elif length is not None and length.isdigit() and 'HEAD' != environ.get('REQUEST_METHOD'):
+            measure.size = int(length)
+
+        self.metrics.observe(measure)
+
+        return chunks
+
+    @classmethod
+    def release(cls, environ: WSGIEnvironment, chunks: Iterable[bytes], tokens: tuple[Token, ...]) -> Iterable[bytes]:
+        if cls.unwrapped(environ, chunks):
+            restore(tokens)
+
+            return chunks
+
+        return Closing(chunks, tokens)
+
+    @staticmethod
+    def unwrapped(environ: WSGIEnvironment, chunks: Iterable[bytes]) -> bool:
+        return isinstance(chunks, (list, tuple)) or (
+                isinstance(wrapper := environ.get('wsgi.file_wrapper'), type) and isinstance(chunks, wrapper)
+        )
+
+    @staticmethod
+    def context(environ: WSGIEnvironment) -> tuple[Token, ...]:
+        dt = datetime.now(tz=timezone.utc)
+
+        return tuple(variable.set(value) for variable, value in (
+                (utc.now_context, dt),
+                (utc.timestamp_context, dt.timestamp()),
+                (http.call_context, EnvironParse(environ)),
+                (http.environ_context, environ),
+                (header.simple_context, dict()),
+                (header.cookie_context, dict()),
+        ))
 
 
 class HttpRequest(object):
@@ -85,15 +197,29 @@ class HttpRequest(object):
 
 
 class HttpResponse(object):
-    __slots__ = ('__file', 'header', 'static')
+    __slots__ = ('__file', '__stream', 'header', 'static')
 
     def __init__(self):
         self.__file = File
+        self.__stream = Stream
         self.header = header
         self.static = static
 
     def file(self, filepath: str | os.PathLike):
-        if os.path.isfile(filepath):
-            return self.__file(filepath)
+        if (stat := self.static.lookup(filepath)) is not None:
+            return self.__file(filepath, stat)
 
         return b'File not found', 404
+
+    def stream(
+            self,
+            chunks: Iterable[bytes | str],
+            code: int = None,
+            mimetype: str = None,
+            encoding: str = None,
+            length: int = None,
+    ):
+        return self.__stream(chunks, code, None, mimetype, encoding, length)
+
+    def stream_json(self, items: Iterable[Any], code: int = None):
+        return self.__stream(array(items), code, None, 'application/json')
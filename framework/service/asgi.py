@@ -0,0 +1,219 @@
+import asyncio
+import inspect
+import io
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from . import Service
+from .http import CallableResponse, Route
+from .http.parse import decimal, Body, Form, RequestError
+from ..utils.alias import ASGIMessage, ASGIReceive, ASGIScope, ASGISend, WSGIEnvironment
+from ..utils.context import restore
+from ..utils.metrics import Measure
+
+
+def environ_from(scope: ASGIScope) -> WSGIEnvironment:
+    server = scope.get('server') or ('localhost', 80)
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'asgi.scope': scope,
+    }
+
+    if client := scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = client[0], str(client[1])
+
+    for name, value in scope.get('headers', ()):
+        name, value = name.decode('latin-1').upper().replace('-', '_'), value.decode('latin-1')
+
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f"HTTP_{name}"
+
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+
+    return environ
+
+
+class AsyncService(Service):
+    async def __call__(self, scope: ASGIScope, receive: ASGIReceive, send: ASGISend):
+        if 'lifespan' == scope['type']:
+            return await self.lifespan(receive, send)
+
+        if 'http' != scope['type']:
+            return None
+
+        if self.metrics is None:
+            return await self.handle(environ_from(scope), receive, send, None)
+
+        async def measured(message: ASGIMessage):
+            if 'http.response.start' == message['type']:
+                measure.status = str(message['status'])
+
+            else:
+                measure.size += len(message.get('body', b''))
+
+            await send(message)
+
+        measure = Measure()
+
+        try:
+            return await self.handle(environ_from(scope), receive, measured, measure)
+
+        finally:
+            self.metrics.observe(measure)
+
+    async def handle(self, environ: WSGIEnvironment, receive: ASGIReceive, send: ASGISend, measure: Measure | None):
+        tokens = self.context(environ)
+
+        try:
+            return await self.respond(environ, receive, send, measure)
+
+        finally:
+            restore(tokens)
+
+    async def respond(self, environ: WSGIEnvironment, receive: ASGIReceive, send: ASGISend, measure: Measure | None):
+        link, kwargs = self.mapped.parse(environ)
+
+        if measure is not None:
+            measure.link, measure.routed = link, time.perf_counter()
+
+        if link is None:
+            return await self.send(await self.failure(404), send, environ)
+
+        try:
+            environ['wsgi.input'] = await self.receive(receive, environ)
+
+        except RequestError as e:
+            response = await self.failure(e.code)
+
+        else:
+            if (response := self.cached(link, kwargs)) is None:
+                response = self.store(link, kwargs, await self.dispatch(link, kwargs))
+
+        if measure is not None:
+            measure.handled = time.perf_counter()
+
+        return await self.send(response, send, environ)
+
+    @staticmethod
+    async def lifespan(receive: ASGIReceive, send: ASGISend):
+        while True:
+            if 'lifespan.startup' == (message := await receive())['type']:
+                await send({'type': 'lifespan.startup.complete'})
+
+            elif 'lifespan.shutdown' == message['type']:
+                return await send({'type': 'lifespan.shutdown.complete'})
+
+    @staticmethod
+    async def receive(receive: ASGIReceive, environ: WSGIEnvironment):
+        if 'CONTENT_LENGTH' not in environ:
+            environ['wsgi.input_terminated'] = True
+
+        elif Body.limit is not None and decimal(length := environ['CONTENT_LENGTH'].strip()) and Body.limit < int(length):
+            raise RequestError(413)
+
+        if 'http.request' != (message := await receive())['type'] or not message.get('more_body'):
+            return io.BytesIO(message.get('body', b''))
+
+        stream, received = tempfile.SpooledTemporaryFile(max_size=Form.spool), 0
+
+        while 'http.request' == message['type']:
+            received += stream.write(message.get('body', b''))
+
+            if Body.limit is not None and Body.limit < received:
+                raise RequestError(413)
+
+            if not message.get('more_body'):
+                break
+
+            message = await receive()
+
+        stream.seek(0)
+
+        return stream
+
+    async def dispatch(self, link: str, kwargs: dict[str, Any]) -> CallableResponse:
+        module, name, method, args = self.callback[link]
+
+        try:
+            callback = await self.call(self.resolve(link, (module, name, method)), *args, **kwargs)
+
+        except RequestError as e:
+            return await self.failure(e.code)
+
+        return self.result(callback)
+
+    async def failure(self, code: int) -> CallableResponse:
+        if self.not_found is None:
+            return self.error(code)
+
+        return self.result(await self.call(self.resolve(None, self.not_found), code))
+
+    @staticmethod
+    async def call(endpoint: Callable[..., Any], *args, **kwargs) -> Any:
+        if inspect.iscoroutinefunction(endpoint):
+            return await endpoint(*args, **kwargs)
+
+        if inspect.isawaitable(callback := await asyncio.to_thread(endpoint, *args, **kwargs)):
+            return await callback
+
+        return callback
+
+    @staticmethod
+    async def send(response: CallableResponse, send: ASGISend, environ: WSGIEnvironment):
+        started, pending = list(), list()
+
+        def start_response(status: str, headers: list[tuple[str, str]], *_):
+            started[:] = status, headers
+
+            return pending.append
+
+        if isinstance(response, Route):
+            chunks, inline = (b''.join(response(start_response)),), True
+
+        else:
+            chunks = response(start_response)
+            inline = isinstance(chunks, (list, tuple))
+
+        iterator = iter(chunks)
+
+        async def pull():
+            return next(iterator, None) if inline else await asyncio.to_thread(next, iterator, None)
+
+        try:
+            chunk = await pull()
+
+            await send({
+                'type': 'http.response.start',
+                'status': int(started[0][:3]),
+                'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in started[1]],
+            })
+
+            if 'HEAD' == environ['REQUEST_METHOD']:
+                chunk, pending = None, ()
+
+            for data in pending:
+                await send({'type': 'http.response.body', 'body': bytes(data), 'more_body': True})
+
+            while chunk is not None:
+                following = await pull()
+
+                await send({'type': 'http.response.body', 'body': bytes(chunk), 'more_body': following is not None})
+
+                if (chunk := following) is None:
+                    return None
+
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+        finally:
+            if (close := getattr(chunks, 'close', None)) is not None:
+                close() if inline else await asyncio.to_thread(close)
@@ -1,29 +1,56 @@
+import asyncio
+import errno
+import hashlib
+import inspect
 import mimetypes
 import os
+import secrets
 import sys
-from collections.abc import Callable, Generator
+import threading
+import time
+import zlib
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future
+from contextvars import ContextVar, copy_context
+from email.utils import parsedate_to_datetime
 from typing import Any, TypeAlias
 
 from . import header
-from .parse import EnvironParse
+from .header import format_expires
+from .parse import accepts, byteranges, EnvironParse, RequestError
 from ...routing import Map
 from ...routing.urlmap import Callback
+from ...utils import utc
 from ...utils.alias import HeadersAlias, StartResponse, WSGIEnvironment
+from ...utils.context import contextual
+from ...utils.lru import LRU
+from ...utils.serialize import dumps
 
 CallableResponse: TypeAlias = Callable[[StartResponse], Generator[bytes]]
 
 call: EnvironParse
 environ: WSGIEnvironment
 
+call_context: ContextVar[EnvironParse] = ContextVar('call')
+environ_context: ContextVar[WSGIEnvironment] = ContextVar('environ', default=dict())
+
+contextual(__name__, call=call_context, environ=environ_context)
+
 
 def status(code: int):
     status_codes = {
         200: '200 OK',
+        206: '206 Partial Content',
         301: '301 Moved Permanently',
         302: '302 Moved Temporarily',
+        304: '304 Not Modified',
         307: '307 Temporary Redirect',
         308: '308 Permanent Redirect',
+        400: '400 Bad Request',
         404: '404 Not Found',
+        411: '411 Length Required',
+        413: '413 Content Too Large',
+        416: '416 Range Not Satisfiable',
         500: '500 Internal Server Error',
         520: '520 Unknown Error',
     }
@@ -31,12 +58,45 @@ def status(code: int):
     return status_codes[code if code in status_codes.keys() else 520]
 
 
+def compressible(mimetype: str):
+    mimetype = mimetype.split(';', 1)[0]
+
+    return mimetype.startswith('text/') or mimetype.endswith(('+json', '+xml')) or mimetype in (
+        'application/javascript',
+        'application/json',
+        'application/xml',
+        'image/svg+xml',
+    )
+
+
+def modified(etag: str, mtime: int = None):
+    environ = environ_context.get()
+
+    if environ.get('REQUEST_METHOD', 'GET') not in ('GET', 'HEAD'):
+        return True
+
+    if (value := environ.get('HTTP_IF_NONE_MATCH')) is not None:
+        if '*' == value.strip():
+            return False
+
+        return etag.removeprefix('W/') not in (v.strip().removeprefix('W/') for v in value.split(','))
+
+    if mtime is not None and (value := environ.get('HTTP_IF_MODIFIED_SINCE')) is not None:
+        try:
+            return mtime > parsedate_to_datetime(value).timestamp()
+
+        except (TypeError, ValueError):
+            pass
+
+    return True
+
+
 class Http(object):
     __slots__ = ('encoding', 'buffer_size', 'size', 'headers', 'mimetype')
 
     encoding: str
     buffer_size: int
-    size: int
+    size: int | None
     headers: HeadersAlias
     mimetype: str
 
@@ -45,7 +105,7 @@ class Http(object):
             mimetype = 'text/plain'
 
         if mimetype.startswith('text/'):
-            if 0 < self.size:
+            if self.size is None or 0 < self.size:
                 if encoding is None:
                     encoding = self.encoding
 
@@ -54,38 +114,214 @@ class Http(object):
         self.mimetype = mimetype
 
     def content_header(self, mimetype: str):
-        self.headers.extend([('content-length', str(self.size)), ('content-type', mimetype)])
+        if self.size is not None:
+            self.headers.append(('content-length', str(self.size)))
+
+        self.headers.append(('content-type', mimetype))
 
         return self.headers
 
 
+class Stat(object):
+    __slots__ = ('size', 'mtime', 'mtime_ns', 'etag', 'last_modified', 'mimetype', 'headers', 'checked', 'content')
+
+    def __init__(self, filepath: str | os.PathLike, stat: os.stat_result):
+        self.size, self.mtime, self.mtime_ns = stat.st_size, int(stat.st_mtime), stat.st_mtime_ns
+        self.etag = '"%x-%x-%x"' % (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        self.last_modified = format_expires(self.mtime)
+        self.mimetype = mimetypes.guess_type(filepath, strict=True)
+        self.headers = (('etag', self.etag), ('last-modified', self.last_modified))
+        self.checked = time.monotonic()
+        self.content: bytes | None = None
+
+    def load(self, filepath: str | os.PathLike):
+        with open(filepath, 'rb') as f:
+            content = f.read()
+
+        if len(content) != self.size:
+            return None
+
+        self.content = content
+
+        return content
+
+
 class File(Http):
-    __slots__ = ('filepath',)
+    __slots__ = ('filepath', 'stat')
 
-    def __init__(self, filepath: str):
-        self.filepath, self.size, self.headers = filepath, os.path.getsize(filepath), HeadersAlias()
+    socket: str | None = None
+    precompressed: Callable[[str], Stat | None] | None = None
 
-        self.mime(*mimetypes.guess_type(filepath, strict=True))
+    def __init__(self, filepath: str | os.PathLike, stat: Stat = None):
+        if stat is None:
+            stat = Stat(filepath, os.stat(filepath))
 
-        setattr(Routing, 'file', True)
+        self.filepath, self.stat, self.size, self.headers = filepath, stat, stat.size, HeadersAlias()
 
-    def __call__(self, start_response: StartResponse) -> Generator[bytes]:
-        start_response(status(200), self.content_header(self.mimetype))
+        self.mime(*stat.mimetype)
+
+    def __call__(self, start_response: StartResponse) -> Iterable[bytes]:
+        environ = environ_context.get()
+
+        if self.precompressed is not None:
+            self.sibling()
+
+        self.headers.extend(self.stat.headers)
+
+        if not modified(self.stat.etag, self.stat.mtime):
+            start_response(status(304), self.headers)
+
+            return ()
+
+        if 'HTTP_RANGE' in environ and self.if_range():
+            if (ranges := byteranges(environ['HTTP_RANGE'], self.size)) is not None:
+                return self.partial(start_response, ranges)
+
+        self.headers.append(('accept-ranges', 'bytes'))
+
+        write = start_response(status(200), self.content_header(self.mimetype))
+
+        if (content := self.stat.content) is not None:
+            return content,
+
+        if self.socket is not None and (sock := environ.get(self.socket)) is not None:
+            return () if 'HEAD' == environ.get('REQUEST_METHOD') else self.sendfile(write, sock)
+
+        if (wrapper := environ.get('wsgi.file_wrapper')) is not None:
+            try:
+                return wrapper(open(self.filepath, 'rb'), self.buffer_size)
+
+            except OSError:
+                return ()
+
+        return self.read(((0, self.size - 1),))
+
+    def sibling(self):
+        if (stat := self.precompressed(f"{os.fspath(self.filepath)}.gz")) is None or stat.mtime < self.stat.mtime:
+            return
+
+        self.headers.append(('vary', 'accept-encoding'))
+
+        if accepts(environ_context.get().get('HTTP_ACCEPT_ENCODING'), 'gzip'):
+            self.filepath, self.stat, self.size = f"{os.fspath(self.filepath)}.gz", stat, stat.size
+            self.headers.append(('content-encoding', 'gzip'))
+
+    def if_range(self):
+        if (value := environ_context.get().get('HTTP_IF_RANGE')) is None:
+            return True
+
+        return value in (self.stat.etag, self.stat.last_modified)
+
+    def partial(self, start_response: StartResponse, ranges: list[tuple[int, int]]) -> Iterable[bytes]:
+        if not ranges:
+            self.headers.extend([('content-length', '0'), ('content-range', f"bytes */{self.size}")])
+
+            start_response(status(416), self.headers)
+
+            return ()
+
+        if 1 == len(ranges):
+            (start, end), parts, tail = ranges[0], (), b''
+
+            self.headers.extend([
+                ('content-length', str(end - start + 1)),
+                ('content-type', self.mimetype),
+                ('content-range', f"bytes {start}-{end}/{self.size}"),
+            ])
+
+        else:
+            boundary = secrets.token_hex(16)
+
+            parts = tuple(
+                (b'' if 0 == i else b'\r\n') + (
+                    f"--{boundary}\r\n"
+                    f"content-type: {self.mimetype}\r\n"
+                    f"content-range: bytes {start}-{end}/{self.size}\r\n\r\n"
+                ).encode('ascii')
+                for i, (start, end) in enumerate(ranges)
+            )
+            tail = f"\r\n--{boundary}--\r\n".encode('ascii')
+
+            self.headers.extend([
+                ('content-length', str(sum(map(len, parts)) + sum(e - s + 1 for s, e in ranges) + len(tail))),
+                ('content-type', f"multipart/byteranges; boundary={boundary}"),
+            ])
+
+        start_response(status(206), self.headers)
+
+        return self.read(ranges, parts, tail)
+
+    def read(
+            self,
+            ranges: list[tuple[int, int]] | tuple[tuple[int, int], ...],
+            parts: tuple[bytes, ...] = (),
+            tail: bytes = b'',
+    ) -> Generator[bytes]:
+        if (content := self.stat.content) is not None:
+            for i, (start, end) in enumerate(ranges):
+                if parts:
+                    yield parts[i]
+
+                for offset in range(start, end + 1, self.buffer_size):
+                    yield content[offset:min(offset + self.buffer_size, end + 1)]
+
+            if tail:
+                yield tail
+
+            return
 
         try:
-            f = open(self.filepath, 'rb')
-            for i in range(0, self.size, self.buffer_size):
-                yield f.read(self.buffer_size)
+            with open(self.filepath, 'rb') as f:
+                for i, (start, end) in enumerate(ranges):
+                    if parts:
+                        yield parts[i]
+
+                    f.seek(start)
+
+                    remaining = end - start + 1
+
+                    while 0 < remaining and (chunk := f.read(min(self.buffer_size, remaining))):
+                        remaining -= len(chunk)
 
-            f.close()
+                        yield chunk
 
         except OSError:
-            pass
+            return
+
+        if tail:
+            yield tail
+
+    def sendfile(self, write: Callable[[bytes], object], sock: Any) -> Iterable[bytes]:
+        write(b'')
+
+        offset = 0
+
+        with open(self.filepath, 'rb') as f:
+            while offset < self.size:
+                try:
+                    sent = os.sendfile(sock.fileno(), f.fileno(), offset, self.size - offset)
+
+                except BlockingIOError:
+                    return self.read(((offset, self.size - 1),))
+
+                if 0 == sent:
+                    raise OSError(errno.EIO, 'File truncated while sending', self.filepath)
+
+                offset += sent
+
+        return ()
 
 
 class Route(Http):
     __slots__ = ('body', 'code')
 
+    checksum: bool = False
+    compress: bool = False
+    level: int = 6
+    threshold: int = 1024
+    compressed: LRU | None = None
+    cacheable: int = 65536
+
     def __init__(
             self,
             body: Any,
@@ -98,6 +334,12 @@ class Route(Http):
             if isinstance(body, str):
                 body = body.encode(encoding := self.encoding if encoding is None else encoding)
 
+            elif isinstance(body, (dict, list)):
+                body = dumps(body)
+
+                if mimetype is None:
+                    mimetype = 'application/json'
+
             else:
                 body = b''
 
@@ -117,51 +359,282 @@ class Route(Http):
         self.mime(mimetype, encoding)
 
     def __call__(self, start_response: StartResponse) -> Generator[bytes]:
+        gzip = self.compress and self.negotiate()
+        etag = self.etag('-gzip' if gzip else '') if 200 == self.code else None
+
+        if etag is not None and not modified(etag):
+            start_response(status(304), self.headers)
+
+            return
+
+        if gzip:
+            self.deflate()
+
         start_response(status(self.code), self.content_header(self.mimetype))
 
-        for i in range(0, self.size, self.buffer_size):
-            yield self.body[i:i + self.buffer_size]
+        if 0 < self.size:
+            yield self.body
 
+    def negotiate(self):
+        if self.size < self.threshold or not compressible(self.mimetype):
+            return False
 
-def import_callback(module: str, name: str, method: str | None) -> Callable[..., Any]:
+        for name, _ in self.headers:
+            if 'content-encoding' == name:
+                return False
+
+        self.headers.append(('vary', 'accept-encoding'))
+
+        return accepts(environ_context.get().get('HTTP_ACCEPT_ENCODING'), 'gzip')
+
+    def deflate(self):
+        cache = self.compressed if self.size <= self.cacheable else None
+
+        if cache is None or (body := cache.get(self.body)) is None:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+            body = compressor.compress(self.body) + compressor.flush()
+
+            if cache is not None:
+                cache.set(self.body, body)
+
+        self.body, self.size = body, len(body)
+        self.headers.append(('content-encoding', 'gzip'))
+
+    def etag(self, suffix: str = ''):
+        for i, (name, value) in enumerate(self.headers):
+            if 'etag' == name:
+                if suffix and value.endswith('"'):
+                    self.headers[i] = (name, value := f'{value[:-1]}{suffix}"')
+
+                return value
+
+        if self.checksum:
+            self.headers.append(('etag', etag := f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}{suffix}"'))
+
+            return etag
+
+
+class Stream(Http):
+    __slots__ = ('chunks', 'code', 'charset')
+
+    def __init__(
+            self,
+            chunks: Iterable[bytes | str],
+            code: int = None,
+            headers: HeadersAlias = None,
+            mimetype: str = None,
+            encoding: str = None,
+            length: int = None,
+    ):
+        self.chunks, self.size = chunks, length
+
+        if code is None:
+            code = 200
+
+        if headers is None:
+            headers = list()
+
+        headers.extend(header.headers())
+        headers.extend(header.cookies())
+
+        self.code, self.headers, self.charset = code, headers, self.encoding if encoding is None else encoding
+
+        self.mime(mimetype, encoding)
+
+    def __call__(self, start_response: StartResponse) -> Generator[bytes]:
+        start_response(status(self.code), self.content_header(self.mimetype))
+
+        try:
+            for chunk in self.chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(self.charset)
+
+                if chunk:
+                    yield chunk
+
+        finally:
+            if (close := getattr(self.chunks, 'close', None)) is not None:
+                close()
+
+
+class Cached(Route):
+    def __init__(self, code: int, headers: HeadersAlias, body: bytes, mimetype: str):
+        self.code, self.headers, self.body, self.size, self.mimetype = code, list(headers), body, len(body), mimetype
+
+
+def instance(cls: type, method: str) -> Callable[..., Any]:
+    def callback(*args, **kwargs):
+        return getattr(cls(), method)(*args, **kwargs)
+
+    return callback
+
+
+def bind(module: str, name: str, method: str | None, singleton: bool) -> Callable[..., Any]:
     __import__(module)
 
     callback = getattr(sys.modules[module], name)
 
     if method is not None:
-        callback = getattr(callback(), method)
-
-    setattr(Routing, 'file', False)
+        callback = getattr(callback(), method) if singleton else instance(callback, method)
 
     return callback
 
 
+def import_callback(module: str, name: str, method: str | None) -> Callable[..., Any]:
+    return bind(module, name, method, True)
+
+
 def as_tuple(callback: Any):
     return callback if isinstance(callback, tuple) else (callback,)
 
 
-class Routing(object):
-    __slots__ = ('file', 'callback', 'not_found')
+def cache_key(link: str, kwargs: dict[str, Any], query: tuple[str, ...]):
+    return (
+        link,
+        tuple(path.items()) if (path := kwargs.get('path')) is not None else (),
+        tuple(call_context.get().query.get(name) for name in query),
+    )
+
+
+class Loop(object):
+    __slots__ = ('loop', 'thread', 'pid', 'lock')
+
+    def __init__(self):
+        self.loop, self.thread, self.pid, self.lock = None, None, None, threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None or self.pid != os.getpid():
+                self.loop, self.pid = asyncio.new_event_loop(), os.getpid()
+                self.thread = threading.Thread(target=self.loop.run_forever, name='framework-loop', daemon=True)
+                self.thread.start()
+
+            return self.loop
+
+    def stop(self):
+        with self.lock:
+            if self.loop is not None and self.pid == os.getpid():
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join()
+                self.loop.close()
+
+            self.loop = self.thread = self.pid = None
+
+    def run(self, awaitable: Any) -> Any:
+        loop = self.loop if self.loop is not None and self.pid == os.getpid() else self.start()
+        future, context = Future(), copy_context()
+
+        async def wait():
+            return await awaitable
+
+        def done(task: asyncio.Task):
+            if task.cancelled():
+                future.cancel()
 
-    file: bool
+            elif (e := task.exception()) is not None:
+                future.set_exception(e)
 
-    def __init__(self, urlmap: Map, not_found: tuple[str, str, str | None] | None):
+            else:
+                future.set_result(task.result())
+
+        def schedule():
+            task = loop.create_task(awaitable if inspect.iscoroutine(awaitable) else wait(), context=context)
+            task.add_done_callback(done)
+
+        loop.call_soon_threadsafe(schedule)
+
+        return future.result()
+
+
+background = Loop()
+
+
+class Routing(object):
+    __slots__ = ('callback', 'not_found', 'cache', 'bound')
+
+    def __init__(
+            self,
+            urlmap: Map,
+            not_found: tuple[str, str, str | None] | None,
+            eager: bool = False,
+            singleton: bool = False,
+    ):
         self.callback = Callback(urlmap)
         self.not_found = not_found
+        self.cache = {link: (cache, LRU(cache.size)) for link, cache in urlmap.cache.items()}
+        self.bound = dict()
+
+        if eager:
+            for link, (module, name, method, _) in self.callback.items():
+                self.bound[link] = bind(module, name, method, singleton)
+
+            if not_found is not None:
+                self.bound[None] = bind(*not_found, singleton)
+
+    def resolve(self, link: str | None, target: tuple[str, str, str | None]) -> Callable[..., Any]:
+        if (callback := self.bound.get(link)) is None:
+            return import_callback(*target)
+
+        return callback
 
     def error(self, code: int) -> CallableResponse:
         if self.not_found is None:
-            return Route(b'Not Found', code, None, encoding='ascii')
+            return Route(status(code)[4:], code, None, encoding='ascii')
 
-        else:
-            return Route(*as_tuple(import_callback(*self.not_found)(code)))
+        if inspect.isawaitable(callback := self.resolve(None, self.not_found)(code)):
+            callback = background.run(callback)
+
+        return self.result(callback)
+
+    def cacheable(self, link: str):
+        return link in self.cache.keys() and environ_context.get().get('REQUEST_METHOD', 'GET') in ('GET', 'HEAD')
+
+    def cached(self, link: str, kwargs: dict[str, Any]) -> CallableResponse | None:
+        if self.cacheable(link):
+            cache, store = self.cache[link]
+
+            if (cached := store.get(cache_key(link, kwargs, cache.query))) is not None:
+                if utc.timestamp < cached[0]:
+                    return Cached(*cached[1:])
+
+        return None
+
+    def store(self, link: str, kwargs: dict[str, Any], route: CallableResponse) -> CallableResponse:
+        if self.cacheable(link) and isinstance(route, Route) and 200 == route.code:
+            cache, store = self.cache[link]
+
+            store.set(cache_key(link, kwargs, cache.query), (
+                utc.timestamp + cache.ttl,
+                route.code,
+                tuple((k, v) for k, v in route.headers if 'set-cookie' != k),
+                route.body,
+                route.mimetype,
+            ))
+
+        return route
 
     def response(self, link: str, kwargs: dict[str, Any]) -> CallableResponse:
+        if (cached := self.cached(link, kwargs)) is not None:
+            return cached
+
+        return self.store(link, kwargs, self.route(link, kwargs))
+
+    def route(self, link: str, kwargs: dict[str, Any]) -> CallableResponse:
         module, name, method, args = self.callback[link]
 
-        callback = import_callback(module, name, method)(*args, **kwargs)
+        try:
+            callback = self.resolve(link, (module, name, method))(*args, **kwargs)
+
+            if inspect.isawaitable(callback):
+                callback = background.run(callback)
+
+        except RequestError as e:
+            return self.error(e.code)
+
+        return self.result(callback)
 
-        if self.file:
+    def result(self, callback: Any) -> CallableResponse:
+        if isinstance(callback, Http):
             return callback
 
         return Route(*as_tuple(callback))
@@ -1,19 +1,26 @@
 import re
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
 from typing import Literal
 
 from ...utils import utc
+from ...utils.context import contextual
 
 simple: dict[str, str]
 cookie: dict[str, str]
 
+simple_context: ContextVar[dict[str, str]] = ContextVar('simple')
+cookie_context: ContextVar[dict[str, str]] = ContextVar('cookie')
+
+contextual(__name__, simple=simple_context, cookie=cookie_context)
+
 
 def headers():
-    return [(k, v) for k, v in simple.items()]
+    return [(k, v) for k, v in simple_context.get().items()]
 
 
 def cookies():
-    return [('set-cookie', v) for v in cookie.values()]
+    return [('set-cookie', v) for v in cookie_context.get().values()]
 
 
 wd = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
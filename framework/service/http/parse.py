@@ -1,4 +1,7 @@
-from urllib.parse import unquote
+import codecs
+import tempfile
+from collections.abc import Generator
+from urllib.parse import unquote, unquote_plus
 
 from ...utils.alias import WSGIEnvironment
 
@@ -27,12 +30,391 @@ class Cookie(dict[str, str]):
                 self[key] = value
 
 
-class EnvironParse(object):
-    __slots__ = ('query', 'cookie')
+def decimal(value: str):
+    return value.isascii() and value.isdecimal()
+
+
+def byteranges(value: str, size: int, limit: int = 100) -> list[tuple[int, int]] | None:
+    if not value.startswith('bytes=') or limit < len(specs := value[6:].split(',')):
+        return None
+
+    ranges = list()
+
+    for spec in specs:
+        if 2 != len(bounds := spec.strip().split('-')):
+            return None
+
+        first, last = bounds
+
+        if not (decimal(first) or '' == first) or not (decimal(last) or '' == last) or first == last == '':
+            return None
+
+        if '' == first:
+            if 0 < (suffix := int(last)) and 0 < size:
+                ranges.append((max(0, size - suffix), size - 1))
+
+        elif '' == last or int(first) <= int(last):
+            if (start := int(first)) < size:
+                ranges.append((start, size - 1 if '' == last else min(int(last), size - 1)))
+
+        else:
+            return None
+
+    merged = list()
+
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = merged[-1][0], max(merged[-1][1], end)
+
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def accepts(value: str | None, coding: str) -> bool:
+    if not value:
+        return False
+
+    default = False
+
+    for item in value.split(','):
+        name, _, params = item.partition(';')
 
-    query: Query
-    cookie: Cookie
+        if (name := name.strip().lower()) not in (coding, '*'):
+            continue
+
+        try:
+            q = float(params.strip()[2:]) if params.strip().startswith('q=') else 1.0
+
+        except ValueError:
+            q = 0.0
+
+        if coding == name:
+            return 0 < q
+
+        default = 0 < q
+
+    return default
+
+
+class RequestError(Exception):
+    def __init__(self, code: int):
+        super().__init__(code)
+
+        self.code = code
+
+
+class Body(object):
+    __slots__ = ('stream', 'length', 'received')
+
+    limit: int | None = None
 
     def __init__(self, environ: WSGIEnvironment):
-        self.query = Query(environ)
-        self.cookie = Cookie(environ)
+        if (value := environ.get('CONTENT_LENGTH', '').strip()) != '':
+            if not decimal(value):
+                raise RequestError(400)
+
+            length = int(value)
+
+        elif environ.get('wsgi.input_terminated'):
+            length = None
+
+        elif 'chunked' in environ.get('HTTP_TRANSFER_ENCODING', '').lower():
+            raise RequestError(411)
+
+        else:
+            length = 0
+
+        if self.limit is not None and length is not None and self.limit < length:
+            raise RequestError(413)
+
+        self.stream, self.length, self.received = environ.get('wsgi.input'), length, 0
+
+    def available(self, size: int):
+        if self.length is None:
+            if self.limit is None:
+                return size
+
+            return self.limit - self.received + 1 if size < 0 else min(size, self.limit - self.received + 1)
+
+        remaining = self.length - self.received
+
+        return remaining if size < 0 else min(size, remaining)
+
+    def consumed(self, size: int):
+        self.received += size
+
+        if self.limit is not None and self.limit < self.received:
+            raise RequestError(413)
+
+        return size
+
+    def read(self, size: int = -1) -> bytes:
+        if self.stream is None or 0 == (size := self.available(size)):
+            return b''
+
+        data = self.stream.read() if size < 0 else self.stream.read(size)
+
+        self.consumed(len(data))
+
+        return data
+
+    def chunks(self, size: int = 65536) -> Generator[bytes]:
+        while chunk := self.read(size):
+            yield chunk
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        view = memoryview(buffer).cast('B')
+
+        if self.stream is None or 0 == (size := self.available(len(view))):
+            return 0
+
+        if hasattr(self.stream, 'readinto'):
+            count = self.stream.readinto(view[:size]) or 0
+
+        else:
+            view[:(count := len(data := self.stream.read(size)))] = data
+
+        return self.consumed(count)
+
+
+def options(value: str) -> tuple[str, dict[str, str]]:
+    mimetype, *params = value.split(';')
+
+    result = dict()
+
+    for param in params:
+        if '=' in param:
+            key, value = param.split('=', 1)
+
+            if 2 <= len(value := value.strip()) and value.startswith('"') and value.endswith('"'):
+                value = value[1:-1].replace('\\"', '"')
+
+            result[key.strip().lower()] = value
+
+    return mimetype.strip().lower(), result
+
+
+class Upload(object):
+    __slots__ = ('name', 'filename', 'mimetype', 'size', 'file')
+
+    def __init__(self, name: str, filename: str, mimetype: str, spool: int):
+        self.name, self.filename, self.mimetype, self.size = name, filename, mimetype, 0
+        self.file = tempfile.SpooledTemporaryFile(max_size=spool)
+
+    def write(self, data: bytes | bytearray):
+        self.size += self.file.write(data)
+
+
+class Form(dict[str, str]):
+    __slots__ = ('files', 'received', 'pending')
+
+    spool: int = 1048576
+    part_limit: int | None = None
+    limit: int | None = None
+
+    def __init__(self, environ: WSGIEnvironment, body: Body):
+        dict.__init__(self)
+
+        self.files, self.received, self.pending = dict(), 0, None
+
+        mimetype, params = options(environ.get('CONTENT_TYPE', ''))
+
+        try:
+            if 'application/x-www-form-urlencoded' == mimetype:
+                try:
+                    charset = codecs.lookup(params.get('charset', 'utf-8')).name
+
+                except LookupError:
+                    raise RequestError(400)
+
+                self.urlencoded(body, charset)
+
+            elif 'multipart/form-data' == mimetype:
+                if not (boundary := params.get('boundary')):
+                    raise RequestError(400)
+
+                self.multipart(body, boundary.encode('latin-1'))
+
+        except Exception:
+            self.discard()
+
+            raise
+
+    def discard(self):
+        for upload in (*self.files.values(), self.pending):
+            if upload is not None:
+                upload.file.close()
+
+        self.files, self.pending = dict(), None
+
+    def chunks(self, body: Body) -> Generator[bytes]:
+        for chunk in body.chunks():
+            self.received += len(chunk)
+
+            if self.limit is not None and self.limit < self.received:
+                raise RequestError(413)
+
+            yield chunk
+
+    def urlencoded(self, body: Body, charset: str):
+        def pair(data: bytes | bytearray):
+            if self.part_limit is not None and self.part_limit < len(data):
+                raise RequestError(413)
+
+            if data:
+                key, _, value = data.decode(charset, 'replace').partition('=')
+
+                self[unquote_plus(key, charset)] = unquote_plus(value, charset)
+
+        buffer = bytearray()
+
+        for chunk in self.chunks(body):
+            buffer += chunk
+
+            if 0 <= (i := buffer.rfind(b'&')):
+                for data in buffer[:i].split(b'&'):
+                    pair(data)
+
+                del buffer[:i + 1]
+
+            if self.part_limit is not None and self.part_limit < len(buffer):
+                raise RequestError(413)
+
+        pair(buffer)
+
+    def multipart(self, body: Body, boundary: bytes):
+        delimiter, buffer = b'\r\n--' + boundary, bytearray(b'\r\n')
+        state, part = 'preamble', None
+
+        for chunk in self.chunks(body):
+            buffer += chunk
+
+            while True:
+                if state in ('preamble', 'data'):
+                    if (i := buffer.find(delimiter)) < 0:
+                        if len(delimiter) < len(buffer):
+                            if 'data' == state:
+                                self.part(part, buffer[:len(buffer) - len(delimiter)])
+
+                            del buffer[:len(buffer) - len(delimiter)]
+
+                        break
+
+                    if 'data' == state:
+                        self.close(self.part(part, buffer[:i]))
+
+                    del buffer[:i + len(delimiter)]
+
+                    state = 'boundary'
+
+                if 'boundary' == state:
+                    if len(buffer) < 2:
+                        break
+
+                    if b'--' == buffer[:2]:
+                        return
+
+                    if b'\r\n' != buffer[:2]:
+                        raise RequestError(400)
+
+                    del buffer[:2]
+
+                    state = 'headers'
+
+                if 'headers' == state:
+                    if (i := buffer.find(b'\r\n\r\n')) < 0:
+                        if 16384 < len(buffer):
+                            raise RequestError(400)
+
+                        break
+
+                    part = self.headers(bytes(buffer[:i]))
+
+                    del buffer[:i + 4]
+
+                    state = 'data'
+
+        raise RequestError(400)
+
+    def headers(self, data: bytes):
+        disposition, mimetype = None, 'text/plain'
+
+        for line in data.decode('utf-8', 'replace').split('\r\n'):
+            name, _, value = line.partition(':')
+
+            if 'content-disposition' == (name := name.strip().lower()):
+                disposition = options(value)
+
+            elif 'content-type' == name:
+                mimetype = value.strip()
+
+        if disposition is None or 'form-data' != disposition[0] or 'name' not in disposition[1]:
+            raise RequestError(400)
+
+        if (filename := disposition[1].get('filename')) is None:
+            return [disposition[1]['name'], bytearray()]
+
+        self.pending = Upload(disposition[1]['name'], filename, mimetype, self.spool)
+
+        return self.pending
+
+    def part(self, part: list | Upload, data: bytes | bytearray):
+        if isinstance(part, Upload):
+            part.write(data)
+
+            if self.part_limit is not None and self.part_limit < part.size:
+                raise RequestError(413)
+
+        else:
+            part[1] += data
+
+            if self.part_limit is not None and self.part_limit < len(part[1]):
+                raise RequestError(413)
+
+        return part
+
+    def close(self, part: list | Upload):
+        if isinstance(part, Upload):
+            part.file.seek(0)
+
+            self.files[part.name], self.pending = part, None
+
+        else:
+            self[part[0]] = part[1].decode('utf-8', 'replace')
+
+
+class EnvironParse(object):
+    __slots__ = ('environ', '__query', '__cookie', '__body', '__form')
+
+    def __init__(self, environ: WSGIEnvironment):
+        self.environ, self.__query, self.__cookie, self.__body, self.__form = environ, None, None, None, None
+
+    @property
+    def query(self) -> Query:
+        if self.__query is None:
+            self.__query = Query(self.environ)
+
+        return self.__query
+
+    @property
+    def cookie(self) -> Cookie:
+        if self.__cookie is None:
+            self.__cookie = Cookie(self.environ)
+
+        return self.__cookie
+
+    @property
+    def body(self) -> Body:
+        if self.__body is None:
+            self.__body = Body(self.environ)
+
+        return self.__body
+
+    @property
+    def form(self) -> Form:
+        if self.__form is None:
+            self.__form = Form(self.environ, self.body)
+
+        return self.__form
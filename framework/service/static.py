@@ -1,7 +1,18 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from stat import S_ISREG
+
+from .http import Stat
 from ..routing.urlmap import Link
+from ..utils.lru import LRU
 
 urlpath: str
 link: Link
+files: LRU | None = None
+interval: float = 1.0
+memory: 'Memory | None' = None
 
 
 def valid(url: str | None):
@@ -24,3 +35,111 @@ def valid(url: str | None):
         )
 
     return url
+
+
+class Memory(object):
+    __slots__ = ('budget', 'preload', 'used', 'data', 'lock')
+
+    def __init__(self, budget: int, preload: int):
+        self.budget, self.preload, self.used = budget, preload, 0
+        self.data, self.lock = OrderedDict(), threading.Lock()
+
+    def __len__(self):
+        return self.data.__len__()
+
+    def touch(self, key: str):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+
+    def pop(self, key: str):
+        with self.lock:
+            if (stat := self.data.pop(key, None)) is not None:
+                self.used -= stat.size
+                stat.content = None
+
+    def load(self, key: str, stat: Stat):
+        with self.lock:
+            if (previous := self.data.pop(key, None)) is not None:
+                self.used -= previous.size
+
+                if previous.etag == stat.etag:
+                    stat.content = previous.content
+
+                else:
+                    previous.content = None
+
+            if stat.content is None:
+                if self.budget < stat.size or self.preload < stat.size:
+                    return
+
+                try:
+                    stat.load(key)
+
+                except OSError:
+                    return
+
+                if stat.content is None:
+                    return
+
+            self.data[key] = stat
+            self.used += stat.size
+
+            while self.budget < self.used:
+                _, evicted = self.data.popitem(last=False)
+
+                self.used -= evicted.size
+                evicted.content = None
+
+
+class Missing(object):
+    __slots__ = ('checked',)
+
+    def __init__(self):
+        self.checked = time.monotonic()
+
+
+def lookup(filepath: str | os.PathLike):
+    key = os.fspath(filepath)
+
+    if files is not None and (stat := files.get(key)) is not None:
+        if time.monotonic() < stat.checked + interval:
+            if isinstance(stat, Missing):
+                return None
+
+            if memory is not None and stat.content is not None:
+                memory.touch(key)
+
+            return stat
+
+    else:
+        stat = None
+
+    try:
+        result = os.stat(key)
+
+    except OSError:
+        result = None
+
+    if result is None or not S_ISREG(result.st_mode):
+        if files is not None:
+            files.set(key, Missing())
+
+        if memory is not None:
+            memory.pop(key)
+
+        return None
+
+    if isinstance(stat, Stat) and (stat.mtime_ns, stat.size) == (result.st_mtime_ns, result.st_size):
+        stat.checked = time.monotonic()
+
+    else:
+        stat = Stat(key, result)
+
+        if files is not None:
+            files.set(key, stat)
+
+    if memory is not None and stat.content is None:
+        memory.load(key, stat)
+
+    return stat
@@ -0,0 +1,56 @@
+import sys
+import types
+from collections.abc import Iterable
+from contextvars import ContextVar, Token
+
+
+def attribute(name: str, variable: ContextVar):
+    def getter(_: types.ModuleType):
+        try:
+            return variable.get()
+
+        except LookupError:
+            raise AttributeError(name) from None
+
+    def setter(_: types.ModuleType, value):
+        variable.set(value)
+
+    return property(getter, setter)
+
+
+def contextual(module: str, **variables: ContextVar):
+    namespace = sys.modules[module]
+
+    for name in variables.keys():
+        namespace.__dict__.pop(name, None)
+
+    namespace.__class__ = type('ContextModule', (types.ModuleType,), {
+        name: attribute(f"{module}.{name}", variable) for name, variable in variables.items()
+    })
+
+
+def restore(tokens: tuple[Token, ...]):
+    for token in reversed(tokens):
+        try:
+            token.var.reset(token)
+
+        except ValueError:
+            pass
+
+
+class Closing(object):
+    __slots__ = ('chunks', 'tokens')
+
+    def __init__(self, chunks: Iterable[bytes], tokens: tuple[Token, ...]):
+        self.chunks, self.tokens = chunks, tokens
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        try:
+            if (close := getattr(self.chunks, 'close', None)) is not None:
+                close()
+
+        finally:
+            restore(self.tokens)
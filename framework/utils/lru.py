@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class LRU(object):
+    __slots__ = ('size', 'hits', 'misses', 'data', 'lock')
+
+    def __init__(self, size: int):
+        if 1 > size:
+            raise ValueError("LRU cache size must be a positive integer: '%s'." % size)
+
+        self.size, self.hits, self.misses = size, 0, 0
+        self.data, self.lock = OrderedDict(), threading.Lock()
+
+    def __len__(self):
+        return self.data.__len__()
+
+    def get(self, key: Hashable, default: Any = None):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+
+                return self.data[key]
+
+            self.misses += 1
+
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+
+            if self.size < self.data.__len__():
+                self.data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self.lock:
+            return self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.hits = self.misses = 0
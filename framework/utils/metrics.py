@@ -0,0 +1,151 @@
+import bisect
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+
+class Histogram(object):
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds, self.counts, self.count, self.sum = bounds, [0] * (len(bounds) + 1), 0, 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        buckets, total = list(), 0
+
+        for bound, count in zip((*self.bounds, '+Inf'), self.counts):
+            total += count
+            buckets.append([bound, total])
+
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class Measure(object):
+    __slots__ = ('link', 'status', 'size', 'start', 'routed', 'handled', 'done')
+
+    def __init__(self):
+        self.link, self.status, self.size, self.done = None, None, 0, False
+        self.start = self.routed = self.handled = time.perf_counter()
+
+
+class LinkMetrics(object):
+    __slots__ = ('count', 'status', 'routing', 'handler', 'response', 'size')
+
+    def __init__(self, latency: tuple[float, ...], sizes: tuple[int, ...]):
+        self.count, self.status = 0, dict()
+        self.routing, self.handler, self.response = Histogram(latency), Histogram(latency), Histogram(latency)
+        self.size = Histogram(sizes)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'status': dict(self.status),
+            'routing': self.routing.snapshot(),
+            'handler': self.handler.snapshot(),
+            'response': self.response.snapshot(),
+            'size': self.size.snapshot(),
+        }
+
+
+def label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics(object):
+    __slots__ = ('links', 'not_found', 'lock')
+
+    latency: tuple[float, ...] = (
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    )
+    sizes: tuple[int, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+    def __init__(self):
+        self.links, self.not_found, self.lock = dict(), 0, threading.Lock()
+
+    def observe(self, measure: Measure):
+        if measure.done:
+            return
+
+        measure.done, end = True, time.perf_counter()
+
+        with self.lock:
+            if measure.link is None:
+                self.not_found += 1
+
+                return
+
+            if (metrics := self.links.get(measure.link)) is None:
+                metrics = self.links[measure.link] = LinkMetrics(self.latency, self.sizes)
+
+            metrics.count += 1
+            metrics.status[measure.status] = metrics.status.get(measure.status, 0) + 1
+            metrics.routing.observe(measure.routed - measure.start)
+            metrics.handler.observe(measure.handled - measure.routed)
+            metrics.response.observe(end - measure.handled)
+            metrics.size.observe(measure.size)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                'not_found': self.not_found,
+                'links': {link: metrics.snapshot() for link, metrics in self.links.items()},
+            }
+
+    def export(self) -> str:
+        snapshot, lines = self.snapshot(), list()
+
+        lines.append('# TYPE framework_not_found_total counter')
+        lines.append(f"framework_not_found_total {snapshot['not_found']}")
+        lines.append('# TYPE framework_requests_total counter')
+
+        links = {label(link): metrics for link, metrics in snapshot['links'].items()}
+
+        for link, metrics in links.items():
+            for code, count in metrics['status'].items():
+                lines.append(f'framework_requests_total{{link="{link}",status="{label(code)}"}} {count}')
+
+        for name, unit in (('routing', 'seconds'), ('handler', 'seconds'), ('response', 'seconds'), ('size', 'bytes')):
+            lines.append(f"# TYPE framework_{name}_{unit} histogram")
+
+            for link, metrics in links.items():
+                for bound, count in metrics[name]['buckets']:
+                    lines.append(f'framework_{name}_{unit}_bucket{{link="{link}",le="{bound}"}} {count}')
+
+                lines.append(f'framework_{name}_{unit}_sum{{link="{link}"}} {metrics[name]["sum"]}')
+                lines.append(f'framework_{name}_{unit}_count{{link="{link}"}} {metrics[name]["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.links.clear()
+            self.not_found = 0
+
+
+class Measured(object):
+    __slots__ = ('chunks', 'metrics', 'measure')
+
+    def __init__(self, chunks: Iterable[bytes], metrics: Metrics, measure: Measure):
+        self.chunks, self.metrics, self.measure = chunks, metrics, measure
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.measure.size += len(chunk)
+
+            yield chunk
+
+        self.metrics.observe(self.measure)
+
+    def close(self):
+        try:
+            if (close := getattr(self.chunks, 'close', None)) is not None:
+                close()
+
+        finally:
+            self.metrics.observe(self.measure)
@@ -0,0 +1,68 @@
+import dataclasses
+import datetime
+import enum
+import json
+import math
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+
+def default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    if isinstance(value, uuid.UUID):
+        return str(value)
+
+    if isinstance(value, enum.Enum):
+        return value.value
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def finite(value: Any) -> Any:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+
+    if isinstance(value, dict):
+        return {k: finite(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [finite(v) for v in value]
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return finite(default(value))
+
+    return value
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    try:
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':'), allow_nan=False, default=default)
+
+    except ValueError:
+        data = json.dumps(finite(value), ensure_ascii=False, separators=(',', ':'), allow_nan=False, default=default)
+
+    return data.encode('utf-8')
+
+
+def array(items: Iterable[Any]) -> Iterable[bytes]:
+    yield b'['
+
+    for i, item in enumerate(items):
+        yield dumps(item) if 0 == i else b',' + dumps(item)
+
+    yield b']'
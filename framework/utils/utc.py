@@ -1,4 +1,12 @@
+from contextvars import ContextVar
 from datetime import datetime
 
+from .context import contextual
+
 now: datetime
 timestamp: float
+
+now_context: ContextVar[datetime] = ContextVar('now')
+timestamp_context: ContextVar[float] = ContextVar('timestamp')
+
+contextual(__name__, now=now_context, timestamp=timestamp_context)
@@ -10,3 +10,9 @@ class Request(HttpRequest):
 
     def cookie(self, name: str):
         return self.http.call.cookie.get(name)
+
+    def body(self):
+        return self.http.call.body
+
+    def form(self):
+        return self.http.call.form
@@ -1,6 +1,8 @@
+import io
 import unittest
 
-from framework.http import env, query, cookie
+from framework.http import env, query, cookie, body, form
+from framework.routing import Rule, Endpoint, Map
 from framework.service import http, Service
 
 from .. import DummyStartResponse
@@ -8,6 +10,14 @@ from .. import DummyStartResponse
 app, start_response = Service(), DummyStartResponse()
 
 
+def dummy_upload():
+    return str([len(chunk) for chunk in body().chunks(2)])
+
+
+def dummy_form():
+    return form()
+
+
 class TestModule(unittest.TestCase):
     def test_env(self):
         environ = dict(PATH_INFO='', QUERY_STRING='')
@@ -59,6 +69,42 @@ class TestModule(unittest.TestCase):
         self.assertEqual('one cookie', cookie('one'))
         self.assertEqual('two cookie', cookie('two'))
 
+    def test_body(self):
+        def response(data: bytes):
+            environ['wsgi.input'], environ['CONTENT_LENGTH'] = io.BytesIO(data), str(len(data))
+
+            return b''.join(upload(environ, start_response))
+
+        environ = dict(PATH_INFO='/upload', QUERY_STRING='', REQUEST_METHOD='POST')
+
+        upload = Service(Map((
+            Rule('/upload', 'upload'),
+            Endpoint('upload', dummy_upload),
+        )), max_body_size=8)
+
+        self.assertEqual(b'[2, 2, 2]', response(b'bodybo'))
+        self.assertEqual('200 OK', start_response.status)
+
+        self.assertEqual(b'Content Too Large', response(b'body body'))
+        self.assertEqual('413 Content Too Large', start_response.status)
+
+        Service()
+
+    def test_form(self):
+        environ = {
+            'PATH_INFO': '/form',
+            'QUERY_STRING': '',
+            'REQUEST_METHOD': 'POST',
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': '15',
+            'wsgi.input': io.BytesIO(b'one=1&two=t+w+o'),
+        }
+
+        self.assertEqual(b'{"one":"1","two":"t w o"}', b''.join(Service(Map((
+            Rule('/form', 'form'),
+            Endpoint('form', dummy_form),
+        )))(environ, start_response)))
+
 
 def request_tests():
     suite = unittest.TestSuite()
@@ -67,6 +113,8 @@ def request_tests():
             'test_env',
             'test_query',
             'test_cookie',
+            'test_body',
+            'test_form',
     ):
         suite.addTest(TestModule(test))
 
@@ -2,7 +2,7 @@ import os
 import unittest
 
 from framework.http import url_file, url_for
-from framework.http import file
+from framework.http import file, stream, stream_json
 from framework.http import redirect
 from framework.http import set_header, get_header, has_header, delete_header
 from framework.http import set_cookie, delete_cookie
@@ -40,6 +40,19 @@ def dummy_file(path: Path):
     return file(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static', path['filename'])))
 
 
+def dummy_stream(path: Path):
+    set_header('x-rows', str(path['rows']))
+
+    return stream((f"{i}\n" for i in range(path['rows'])), mimetype='text/csv')
+
+
+def dummy_json(path: Path):
+    if 'array' == path['name']:
+        return stream_json({'row': i} for i in range(3))
+
+    return {'name': path['name'], 'rows': [1, 2]}
+
+
 def dummy_redirect(path: Path):
     url = url_for('dummy', dummy=path['redirect'])
 
@@ -201,6 +214,42 @@ class TestModule(Headers):
         self.assertEqual(content_length, length)
         self.assertEqual(content_type, mimetype)
 
+    def test_stream(self):
+        environ['PATH_INFO'] = '/stream/3'
+
+        app = Service(Map((
+            Rule('/stream/<int:rows>', 'stream'),
+            Endpoint('stream', dummy_stream),
+        )))
+
+        self.assertEqual(b'0\n1\n2\n', b''.join(app(environ, start_response)))
+        self.assertListEqual(
+            [('x-rows', '3'), ('content-type', 'text/csv; charset=utf-8')], start_response.headers
+        )
+
+    def test_json(self):
+        def response(path_info: str):
+            environ['PATH_INFO'] = path_info
+
+            return b''.join(app(environ, start_response)), dict(start_response.headers)
+
+        app = Service(Map((
+            Rule('/json/<name>', 'json'),
+            Endpoint('json', dummy_json),
+        )))
+
+        body, headers = response('/json/object')
+
+        self.assertEqual(b'{"name":"object","rows":[1,2]}', body)
+        self.assertEqual('application/json', headers['content-type'])
+        self.assertEqual(str(len(body)), headers['content-length'])
+
+        body, headers = response('/json/array')
+
+        self.assertEqual(b'[{"row":0},{"row":1},{"row":2}]', body)
+        self.assertEqual('application/json', headers['content-type'])
+        self.assertNotIn('content-length', headers)
+
     def test_redirect(self):
         def response(target: str, code: int):
             environ['PATH_INFO'] = url_for('redirect', redirect=target, code=str(code))
@@ -257,6 +306,8 @@ def response_tests():
             'test_url_file',
             'test_url_for',
             'test_file',
+            'test_stream',
+            'test_json',
             'test_redirect',
             'test_headers',
     ):
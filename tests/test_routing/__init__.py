@@ -1,7 +1,7 @@
 import unittest
 from typing import Any
 
-from framework.routing import Rule, Endpoint, Map, Path
+from framework.routing import Rule, Endpoint, Map, Path, Cache
 
 from .. import dummy, Dummy
 
@@ -56,6 +56,13 @@ class TestModule(unittest.TestCase):
         ):
             self.assertTupleEqual(urlmap.mapped[key], model)
 
+        for pattern, model in (
+                ('^/([A-Za-z0-9_-]+)$', ('/<name>', {'name': '[A-Za-z0-9_-]+'})),
+                ('^/(\\d{1,2})$', ('/<name>', {'name': '\\d{1,2}'})),
+                ('^/(\\d+\\.\\d+)$', ('/<name>', {'name': '\\d+\\.\\d+'})),
+        ):
+            self.assertTupleEqual(urlmap.token[pattern], model)
+
         args = callback('slug', 'dummy', None)
 
         self.assertEqual('start', args[0])
@@ -79,9 +86,12 @@ class TestModule(unittest.TestCase):
                  {'slug': (0, r'\d{4}'), 'int': (1, r'\d{2}')}),
             Rule('/<slug>/<int>/<float>', 'link',
                  {'slug': (0, r'\d{4}'), 'int': (1, r'\d{2}'), 'float': (2, r'\d{1}\.\d{2}')}),
-            Endpoint('link', (Dummy, 'dummy'))
+            Endpoint('link', (Dummy, 'dummy'), cache=Cache(60, query=('page',)))
         ))
 
+        self.assertListEqual(['link'], list(urlmap.cache))
+        self.assertTupleEqual((60, 128, ('page',)), tuple(getattr(urlmap.cache['link'], a) for a in Cache.__slots__))
+
         self.assertTupleEqual(urlmap.link['link'], (
             ('^/(\\d{4})$', '/<slug>', ('slug',)),
             ('^/(\\d{4})/(\\d{2})$', '/<slug>/<int>', ('slug', 'int')),
@@ -1,7 +1,8 @@
 import unittest
 
 from framework.routing import Rule, Endpoint, Map
-from framework.routing.urlmap import Link, Mapped, Callback
+from framework.routing.urlmap import Link, Mapped, Radix, Callback
+from framework.utils.lru import LRU
 
 from .. import dummy, Dummy
 
@@ -10,8 +11,21 @@ class TestModule(unittest.TestCase):
     def test_map_blank(self):
         urlmap = Map(())
 
-        for model in (Link(urlmap), Mapped(urlmap), Callback(urlmap)):
-            self.assertDictEqual({}, model.__dict__)
+        self.assertDictEqual({}, Callback(urlmap).__dict__)
+        self.assertDictEqual({'template': {}, 'cache': None}, Link(urlmap).__dict__)
+
+        mapped = Mapped(urlmap)
+
+        self.assertDictEqual({}, mapped.prefix)
+        self.assertDictEqual({}, mapped.literal)
+        self.assertTupleEqual((None, {}), mapped.parse(dict(PATH_INFO='/')))
+
+        radix = Radix(urlmap)
+
+        self.assertDictEqual({}, radix.root.static)
+        self.assertDictEqual({}, radix.root.dynamic)
+        self.assertDictEqual({}, radix.literal)
+        self.assertTupleEqual((None, {}), radix.parse(dict(PATH_INFO='/')))
 
     def test_rule_path(self):
         urlmap = Map((
@@ -97,6 +111,25 @@ class TestModule(unittest.TestCase):
         }.items():
             self.assertTupleEqual(model, links[link])
 
+        self.assertListEqual(
+            [frozenset(('slug',)), frozenset(('slug', 'int')), frozenset(('slug', 'int', 'float'))],
+            list(links.template['link']),
+        )
+
+        path, validators, check = links.template['link'][frozenset(('slug', 'int'))][0]
+
+        self.assertEqual('/{slug}/{int}', path)
+        self.assertListEqual(['[a-z]+', '\\d{4}'], [pattern.pattern for _, pattern in validators])
+        self.assertIsNone(check)
+
+        for args, kwargs in (
+                (('link',), {'slug': 'SLUG'}),
+                (('link',), {'slug': 'slug', 'int': '00'}),
+                (('link',), {'slug': 'slug', 'float': '3.14'}),
+                (('missing',), {}),
+        ):
+            self.assertIsNone(links.collect(args, kwargs))
+
         for args, kwargs in (
                 (('/slug', 'link'), {'slug': 'slug'}),
                 (('/slug/0000', 'link'), {'slug': 'slug', 'int': '0000'}),
@@ -117,6 +150,194 @@ class TestModule(unittest.TestCase):
 
         self.assertTupleEqual(callback['link'], ('tests', 'Dummy', '__call__', ('args',)))
 
+    def test_parse(self):
+        def parse(mapped: Mapped | Radix, path_info: str):
+            link, kwargs = mapped.parse(dict(PATH_INFO=path_info))
+
+            return link, None if (path := kwargs.get('path')) is None else getattr(path, '_Path__token')
+
+        urlmap = Map((
+            Rule('/', 'index'),
+            Rule('/<name>', 'slug'),
+            Rule('/<int:name>', 'int'),
+            Rule('/page/<int(1,2):page>/<float:rate>', 'page'),
+            Rule('/group/<name>', 'group', {'name': (0, r'(a|b)c')}),
+            Rule('/archive/<year>/<month>', 'archive', {'year': (0, r'\d{4}'), 'month': (1, r'\d{2}')}),
+            Rule('/float-<int>/<float>', 'float', {'int': (1, r'\d+'), 'float': (2, r'\d\.\d{2}')}),
+            Rule('/file.txt', 'file'),
+        ))
+
+        mapped, radix = Mapped(urlmap), Radix(urlmap)
+
+        self.assertListEqual(['', None, 'page', 'group', 'archive'], list(mapped.prefix))
+        self.assertEqual(8, sum(len(branch) for chunks in mapped.prefix.values() for _, branch in chunks))
+        self.assertListEqual(['', 'page', 'group', 'archive'], list(radix.root.static))
+        self.assertListEqual(['([A-Za-z0-9_-]+)', '(\\d+)', 'float-(\\d+)'], list(radix.root.dynamic))
+        self.assertListEqual(['^/file.txt$'], list(radix.fallback))
+
+        for path_info, model in (
+                ('/', ('index', None)),
+                ('/001', ('slug', {'name': '001'})),
+                ('/page/12/0.5', ('page', {'page': 12, 'rate': 0.5})),
+                ('/group/ac', ('group', None)),
+                ('/archive/2024/01', ('archive', {'year': '2024', 'month': 1})),
+                ('/float-7/3.14', ('float', {'int': 7, 'float': 3.14})),
+                ('/file.txt', ('file', None)),
+                ('/page/123/0.5', (None, None)),
+                ('/archive/2024', (None, None)),
+                ('/missing/path', (None, None)),
+        ):
+            self.assertTupleEqual(model, parse(mapped, path_info))
+            self.assertTupleEqual(model, parse(radix, path_info))
+
+        self.assertTupleEqual(('slug', {'name': 'page'}), parse(mapped, '/page'))
+        self.assertTupleEqual(('slug', {'name': 'page'}), parse(radix, '/page'))
+
+    def test_fallback(self):
+        urlmap = Map((
+            Rule('/page/<int:pk>', 'page'),
+            Rule('/files/<path>', 'files', {'path': (0, r'.+')}),
+            Rule('/range/<name>', 'range', {'name': (0, r'[!-~]+')}),
+            Rule('/file.txt', 'file'),
+            Rule('/foo/?bar', 'optional'),
+        ))
+
+        mapped, radix = Mapped(urlmap), Radix(urlmap)
+
+        self.assertListEqual(['page'], list(radix.root.static))
+        self.assertEqual(4, len(radix.fallback))
+        self.assertIsNone(Radix(Map((Rule('/<int:pk>', 'page'),))).fallback)
+        self.assertListEqual(['page', 'files', 'range', None], list(mapped.prefix))
+
+        for path_info, model in (
+                ('/page/1', 'page'),
+                ('/files/a/b/c.txt', 'files'),
+                ('/range/a/b', 'range'),
+                ('/file.txt', 'file'),
+                ('/file/txt', 'file'),
+                ('/foobar', 'optional'),
+                ('/foo/bar', 'optional'),
+                ('/page/one', None),
+        ):
+            self.assertEqual(model, mapped.parse(dict(PATH_INFO=path_info))[0])
+            self.assertEqual(model, radix.parse(dict(PATH_INFO=path_info))[0])
+
+        self.assertEqual('a/b/c.txt', radix.parse(dict(PATH_INFO='/files/a/b/c.txt'))[1]['path']['path'])
+
+        for rules, model in (
+                ((Rule('/<f>', 'a', {'f': (0, r'[a-z.]+')}), Rule('/<name>', 'b')), 'a'),
+                ((Rule('/<name>', 'b'), Rule('/<f>', 'a', {'f': (0, r'[a-z.]+')})), 'b'),
+                ((Rule('/<f>', 'a', {'f': (0, r'[a-z.]+')}), Rule('/abc', 'c')), 'a'),
+                ((Rule('/abc', 'c'), Rule('/<f>', 'a', {'f': (0, r'[a-z.]+')})), 'c'),
+        ):
+            urlmap = Map(rules)
+
+            self.assertEqual(model, Mapped(urlmap).parse(dict(PATH_INFO='/abc'))[0])
+            self.assertEqual(model, Radix(urlmap).parse(dict(PATH_INFO='/abc'))[0])
+
+    def test_group(self):
+        mapped = Mapped(Map((
+            Rule('/<name>', 'first', {'name': (0, r'(?P<x>[a-z]+)')}),
+            Rule('/<name>/edit', 'second', {'name': (0, r'(?P<x>[a-z]+)')}),
+            Rule('/<int:pk>', 'third'),
+        )))
+
+        self.assertEqual(2, len(mapped.prefix[None]))
+
+        for path_info, link in (
+                ('/one', 'first'),
+                ('/one/edit', 'second'),
+                ('/1', 'third'),
+                ('/ONE', None),
+        ):
+            self.assertEqual(link, mapped.parse(dict(PATH_INFO=path_info))[0])
+
+        mapped = Mapped(Map((
+            Rule('/<v>', 'double', {'v': (0, r'(\w)\2')}),
+            Rule('/<a>-<b>', 'pair', {'a': (0, r'(\d)\2'), 'b': (0, r'[a-z]+')}),
+            Rule('/<name>', 'slug'),
+        )))
+
+        self.assertEqual(3, len(mapped.prefix[None]))
+
+        for path_info, model in (
+                ('/aa', ('double', {})),
+                ('/ab', ('slug', {'name': 'ab'})),
+                ('/11-x', ('pair', {})),
+                ('/12-x', ('slug', {'name': '12-x'})),
+        ):
+            link, kwargs = mapped.parse(dict(PATH_INFO=path_info))
+
+            self.assertTupleEqual(model, (link, {} if 'path' not in kwargs else dict(kwargs['path'].items())))
+
+    def test_template(self):
+        links = Link(Map((
+            Rule('/a{2}/<name>', 'brace'),
+            Rule('/<name>.txt', 'file'),
+            Rule('/first/<name>', 'order', {'name': (0, r'\d+')}),
+            Rule('/second/<name>', 'order'),
+        )))
+
+        self.assertEqual('/a{{2}}/{name}', links.template['brace'][frozenset(('name',))][0][0])
+        self.assertIsNone(links.collect(('brace',), {'name': 'value'}))
+        self.assertEqual('/value.txt?q', links.collect(('file', 'q'), {'name': 'value'}))
+        self.assertEqual('/first/1?q', links.collect(('order', 'q'), {'name': '1'}))
+        self.assertEqual('/second/one', links.collect(('order',), {'name': 'one'}))
+
+    def test_cache(self):
+        links = Link(Map((
+            Rule('/', 'index'),
+            Rule('/<name>', 'slug', {'name': (0, r'[a-z]+')}),
+        )), 2)
+
+        for _ in range(3):
+            self.assertEqual('/value', links.collect(('slug',), {'name': 'value'}))
+
+        self.assertIsNone(links.collect(('slug',), {'name': 'VALUE'}))
+        self.assertIsNone(links.collect(('slug',), {'name': 'VALUE'}))
+        self.assertEqual((3, 2), (links.cache.hits, links.cache.misses))
+
+        self.assertEqual('/?q', links.collect(('index', 'q'), {}))
+        self.assertEqual(2, len(links.cache))
+        self.assertEqual('/value', links.collect(('slug',), {'name': 'value'}))
+        self.assertEqual((3, 4), (links.cache.hits, links.cache.misses))
+
+        with self.assertRaises(ValueError) as context:
+            LRU(0)
+
+        self.assertEqual("LRU cache size must be a positive integer: '0'.", context.exception.args[0])
+
+    def test_literal(self):
+        urlmap = Map((
+            Rule('/', 'index'),
+            Rule('/health', 'health'),
+            Rule('/<name>', 'slug'),
+            Rule('/api/status', 'status'),
+            Rule('/status', 'shadow'),
+            Rule('/file.txt', 'file'),
+        ))
+
+        self.assertDictEqual(
+            {'/': 'index', '/health': 'health', '/api/status': 'status', '/status': 'shadow'},
+            urlmap.literal,
+        )
+
+        mapped, radix = Mapped(urlmap), Radix(urlmap)
+
+        self.assertDictEqual({'/': 'index', '/health': 'health', '/api/status': 'status'}, mapped.literal)
+        self.assertDictEqual(urlmap.literal, radix.literal)
+
+        for path_info, link in (
+                ('/', 'index'),
+                ('/health', 'health'),
+                ('/api/status', 'status'),
+        ):
+            self.assertTupleEqual((link, {}), mapped.parse(dict(PATH_INFO=path_info)))
+            self.assertTupleEqual((link, {}), radix.parse(dict(PATH_INFO=path_info)))
+
+        self.assertEqual('slug', mapped.parse(dict(PATH_INFO='/status'))[0])
+        self.assertEqual('file', mapped.parse(dict(PATH_INFO='/file.txt'))[0])
+
 
 def urlmap_tests():
     suite = unittest.TestSuite()
@@ -125,6 +346,12 @@ def urlmap_tests():
             'test_map_blank',
             'test_rule_path',
             'test_rule_patterns',
+            'test_parse',
+            'test_fallback',
+            'test_group',
+            'test_template',
+            'test_cache',
+            'test_literal',
     ):
         suite.addTest(TestModule(test))
 
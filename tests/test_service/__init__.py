@@ -1,11 +1,23 @@
+import asyncio
+import contextvars
+import gzip
 import json
 import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
+from wsgiref.util import FileWrapper
 
-from framework.routing import Rule, Endpoint, Map, Path
+from framework.http import file, query, set_cookie, set_header, get_header
+from framework.routing import Rule, Endpoint, Map, Path, Cache
 from framework.service import http, Service
-from framework.service.http import File
+from framework.service.http import background, header, File, Route
 from framework.utils import utc
+from framework.utils.metrics import Metrics
 
 from .test_http import status_codes, Response
 from .. import dummy, Dummy, DummyStartResponse
@@ -44,10 +56,66 @@ def dummy_redirect(path: Path):
     return b'', path['status'], [('location', f"/{path['redirect']}")]
 
 
+def dummy_cache(path: Path):
+    calls.append(path['name'])
+
+    set_header('x-calls', str(len(calls)))
+    set_cookie('session', 'value')
+
+    return f"{path['name']}:{query('page')}:{len(calls)}"
+
+
+def dummy_compress(path: Path):
+    if 'etag' == path['name']:
+        set_header('etag', '"fixed"')
+
+    return 'compress ' * path['size'], None, None, 'image/png' if 'image' == path['name'] else None
+
+
+def dummy_asset(directory: str, path: Path):
+    return file(os.path.join(directory, path['name']))
+
+
+def dummy_concurrent(path: Path):
+    set_header('x-name', path['name'])
+
+    barrier.wait()
+
+    return f"{path['name']}:{query('q')}:{get_header('x-name')}"
+
+
+async def dummy_fetch(port: str):
+    async def fetch():
+        reader, writer = await asyncio.open_connection('127.0.0.1', int(port))
+
+        try:
+            return (await reader.read()).decode()
+
+        finally:
+            writer.close()
+
+    loops.append(asyncio.get_running_loop())
+
+    return ','.join(await asyncio.wait_for(asyncio.gather(*(fetch() for _ in range(3))), 5)) + f":{query('q')}"
+
+
+def dummy_awaitable():
+    return asyncio.sleep(0, result='awaited')
+
+
+calls, loops, barrier = list(), list(), threading.Barrier(4)
+
+
 def dummy_not_found(code: int):
     return b'Dummy Not Found', code
 
 
+async def dummy_async_not_found(code: int):
+    await asyncio.sleep(0)
+
+    return b'Dummy Not Found', code
+
+
 class DummyNotFound(object):
     @staticmethod
     def dummy_not_found(code: int):
@@ -57,6 +125,16 @@ class DummyNotFound(object):
         return b'Dummy Not Found', code
 
 
+class DummyInstance(object):
+    instances = 0
+
+    def __init__(self):
+        DummyInstance.instances += 1
+
+    def __call__(self):
+        return str(DummyInstance.instances)
+
+
 class TestModule(Response):
     def test_status(self):
         def second():
@@ -255,6 +333,385 @@ class TestModule(Response):
             context.exception.args[0],
         )
 
+    def test_radix(self):
+        app = Service(Map((
+            Rule('/', 'index'),
+            Endpoint('index', dummy),
+            Rule('/<name>', 'page'),
+            Endpoint('page', dummy_page),
+            Rule('/date/<int(4):year>/<int(1,2):month>', 'date'),
+            Endpoint('date', dummy_json),
+            Rule('/archive/<year>', 'archive', {'year': (0, r'\d{4}')}),
+            Endpoint('archive', dummy_json),
+        )), radix=True)
+
+        environ['PATH_INFO'] = '/'
+
+        self.assertListEqual(list(), list(app(environ, start_response)))
+
+        environ['PATH_INFO'] = '/page-name'
+
+        self.assertEqual(b'page-name', b''.join(app(environ, start_response)))
+
+        environ['PATH_INFO'] = '/date/2024/5'
+
+        self.assertDictEqual({'year': 2024, 'month': 5}, json.loads(b''.join(app(environ, start_response))))
+
+        environ['PATH_INFO'] = '/archive/2024'
+
+        self.assertDictEqual({'year': '2024'}, json.loads(b''.join(app(environ, start_response))))
+
+        environ['PATH_INFO'] = '/archive/24'
+
+        self.assertEqual(b'Not Found', b''.join(app(environ, start_response)))
+        self.assertEqual('404 Not Found', start_response.status)
+
+    def test_cache(self):
+        def response(path_info: str, query_string: str = '', method: str = 'GET'):
+            environ['PATH_INFO'], environ['QUERY_STRING'], environ['REQUEST_METHOD'] = path_info, query_string, method
+
+            body = b''.join(app(environ, start_response))
+
+            return body, [name for name, _ in start_response.headers]
+
+        app = Service(Map((
+            Rule('/<name>', 'cache'),
+            Endpoint('cache', dummy_cache, cache=Cache(0.05, 2, ('page',))),
+        )))
+
+        calls.clear()
+
+        body, headers = response('/one', 'page=1')
+
+        self.assertEqual(b'one:1:1', body)
+        self.assertIn('set-cookie', headers)
+
+        body, headers = response('/one', 'page=1&other=2')
+
+        self.assertEqual(b'one:1:1', body)
+        self.assertNotIn('set-cookie', headers)
+        self.assertListEqual(['x-calls', 'content-length', 'content-type'], headers)
+        self.assertEqual('200 OK', start_response.status)
+
+        self.assertEqual(b'one:2:2', response('/one', 'page=2')[0])
+        self.assertEqual(b'two:1:3', response('/two', 'page=1')[0])
+        self.assertEqual(b'one:1:4', response('/one', 'page=1', 'POST')[0])
+        self.assertEqual(b'one:1:5', response('/one', 'page=1')[0])
+
+        time.sleep(0.06)
+
+        self.assertEqual(b'one:1:6', response('/one', 'page=1')[0])
+        self.assertEqual(6, len(calls))
+
+        del environ['REQUEST_METHOD']
+
+        environ['QUERY_STRING'] = ''
+
+        with self.assertRaises(ValueError) as context:
+            Cache(0)
+
+        self.assertEqual("URL Map. Cache. TTL must be a positive number: '0'.", context.exception.args[0])
+
+    def test_eager(self):
+        def response(path_info: str):
+            environ['PATH_INFO'] = path_info
+
+            return b''.join(app(environ, start_response))
+
+        urlmap = Map((
+            Rule('/function', 'function'),
+            Endpoint('function', dummy_page, Path({'name': 'function'})),
+            Rule('/instance', 'instance'),
+            Endpoint('instance', DummyInstance),
+        ))
+
+        DummyInstance.instances = 0
+
+        app = Service(urlmap, dummy_not_found, eager=True)
+
+        self.assertListEqual(['function', 'instance', None], list(app.bound))
+        self.assertIs(dummy_page, app.bound['function'])
+        self.assertIs(dummy_not_found, app.bound[None])
+        self.assertEqual(0, DummyInstance.instances)
+
+        self.assertEqual(b'function', response('/function'))
+        self.assertEqual(b'1', response('/instance'))
+        self.assertEqual(b'2', response('/instance'))
+        self.assertEqual(b'Dummy Not Found', response('/missing'))
+
+        DummyInstance.instances = 0
+
+        app = Service(urlmap, (DummyNotFound, 'dummy_not_found'), eager=True, singleton=True)
+
+        self.assertEqual(1, DummyInstance.instances)
+        self.assertEqual(b'1', response('/instance'))
+        self.assertEqual(b'1', response('/instance'))
+        self.assertEqual(b'Dummy Not Found', response('/missing'))
+
+        self.assertDictEqual({}, Service(urlmap).bound)
+
+    def test_compress(self):
+        def response(path_info: str, accept: str = None):
+            environ['PATH_INFO'] = path_info
+
+            if accept is None:
+                environ.pop('HTTP_ACCEPT_ENCODING', None)
+
+            else:
+                environ['HTTP_ACCEPT_ENCODING'] = accept
+
+            return b''.join(app(environ, start_response)), dict(start_response.headers)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        for name, body in (
+                ('style.css', b'body {}' * 64),
+                ('style.css.gz', gzip.compress(b'body {}' * 64)),
+                ('plain.css', b'body {}'),
+        ):
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(body)
+
+        urlmap = Map((
+            Rule('/<name>/<size>', 'compress', {'size': (1, r'\d+')}),
+            Endpoint('compress', dummy_compress),
+            Rule('/asset/<name>', 'asset', {'name': (0, r'[a-z.]+')}),
+            Endpoint('asset', dummy_asset, directory),
+        ))
+
+        app = Service(urlmap, compress=True, compress_size=100, compress_cache=2, compress_cache_body=400, etag=True)
+
+        body, headers = response('/text/20', 'gzip, deflate')
+
+        self.assertEqual(b'compress ' * 20, gzip.decompress(body))
+        self.assertEqual('gzip', headers['content-encoding'])
+        self.assertEqual('accept-encoding', headers['vary'])
+        self.assertEqual(str(len(body)), headers['content-length'])
+        self.assertTrue(headers['etag'].endswith('-gzip"'))
+        self.assertEqual(1, len(Route.compressed))
+
+        self.assertEqual(body, response('/text/20', 'gzip')[0])
+        self.assertEqual(1, Route.compressed.hits)
+
+        self.assertEqual(b'compress ' * 50, gzip.decompress(response('/text/50', 'gzip')[0]))
+        self.assertEqual(1, len(Route.compressed))
+
+        environ['HTTP_IF_NONE_MATCH'] = headers['etag']
+
+        self.assertEqual(b'', response('/text/20', 'gzip')[0])
+        self.assertEqual('304 Not Modified', start_response.status)
+
+        del environ['HTTP_IF_NONE_MATCH']
+
+        body, headers = response('/text/20', 'gzip;q=0')
+
+        self.assertEqual(b'compress ' * 20, body)
+        self.assertNotIn('content-encoding', headers)
+        self.assertEqual('accept-encoding', headers['vary'])
+        self.assertFalse(headers['etag'].endswith('-gzip"'))
+
+        self.assertEqual('"fixed-gzip"', response('/etag/20', 'gzip')[1]['etag'])
+
+        for path_info in ('/text/10', '/image/20'):
+            body, headers = response(path_info, 'gzip')
+
+            self.assertNotIn('content-encoding', headers)
+            self.assertNotIn('vary', headers)
+
+        body, headers = response('/asset/style.css', 'gzip')
+
+        self.assertEqual(b'body {}' * 64, gzip.decompress(body))
+        self.assertEqual('gzip', headers['content-encoding'])
+        self.assertEqual('accept-encoding', headers['vary'])
+        self.assertTrue(headers['content-type'].startswith('text/css'))
+
+        body, headers = response('/asset/style.css')
+
+        self.assertEqual(b'body {}' * 64, body)
+        self.assertNotIn('content-encoding', headers)
+        self.assertEqual('accept-encoding', headers['vary'])
+
+        body, headers = response('/asset/plain.css', 'gzip')
+
+        self.assertEqual(b'body {}', body)
+        self.assertNotIn('vary', headers)
+
+        with mock.patch('os.stat', side_effect=os.stat) as spy:
+            for _ in range(3):
+                response('/asset/plain.css', 'gzip')
+
+        self.assertNotIn(os.path.join(directory, 'plain.css.gz'), [c.args[0] for c in spy.call_args_list])
+
+        app = Service(urlmap)
+
+        self.assertIsNone(File.precompressed)
+        self.assertNotIn('content-encoding', response('/text/20', 'gzip')[1])
+        self.assertNotIn('content-encoding', response('/asset/style.css', 'gzip')[1])
+
+        del environ['HTTP_ACCEPT_ENCODING']
+
+    def test_concurrent(self):
+        def request(name: str):
+            start = DummyStartResponse()
+
+            body = b''.join(app(dict(PATH_INFO=f"/{name}", QUERY_STRING=f"q={name}"), start))
+
+            results[name] = body, dict(start.headers)['x-name']
+
+        app, results = Service(Map((
+            Rule('/<name>', 'concurrent'),
+            Endpoint('concurrent', dummy_concurrent),
+        ))), dict()
+
+        threads = [threading.Thread(target=request, args=(f"n{i}",)) for i in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertDictEqual({f"n{i}": (f"n{i}:n{i}:n{i}".encode(), f"n{i}") for i in range(4)}, results)
+
+    def test_context(self):
+        def request(environ: dict):
+            body = app(environ, start)
+            chunks = b''.join(body)
+
+            if (close := getattr(body, 'close', None)) is not None:
+                close()
+
+            return chunks, http.environ_context.get(), header.simple_context.get(None), utc.now_context.get(None)
+
+        app, start = Service(Map((
+            Rule('/<name>/<size>', 'compress', {'size': (1, r'\d+')}),
+            Endpoint('compress', dummy_compress),
+        )), compress=True, compress_size=10), DummyStartResponse()
+
+        body, environ, simple, now = contextvars.Context().run(
+            request, dict(PATH_INFO='/text/20', QUERY_STRING='', HTTP_ACCEPT_ENCODING='gzip'),
+        )
+
+        self.assertEqual(b'compress ' * 20, gzip.decompress(body))
+        self.assertEqual('gzip', dict(start.headers)['content-encoding'])
+        self.assertTupleEqual(({}, None, None), (environ, simple, now))
+
+        _, environ, simple, now = contextvars.Context().run(request, dict(PATH_INFO='/missing', QUERY_STRING=''))
+
+        self.assertTupleEqual(({}, None, None), (environ, simple, now))
+
+    def test_coroutine(self):
+        def serve():
+            connections = [server.accept()[0] for _ in range(3)]
+
+            for i, connection in enumerate(connections):
+                connection.sendall(f"r{i}".encode())
+                connection.close()
+
+        def response(path_info: str):
+            environ['PATH_INFO'], environ['QUERY_STRING'] = path_info, 'q=query'
+
+            body = b''.join(app(environ, start_response))
+
+            environ['QUERY_STRING'] = ''
+
+            return body
+
+        server = socket.create_server(('127.0.0.1', 0))
+        server.settimeout(5)
+        self.addCleanup(server.close)
+
+        app = Service(Map((
+            Rule('/fetch', 'fetch'),
+            Endpoint('fetch', dummy_fetch, str(server.getsockname()[1])),
+            Rule('/awaitable', 'awaitable'),
+            Endpoint('awaitable', dummy_awaitable),
+        )))
+
+        for _ in range(2):
+            thread = threading.Thread(target=serve)
+            thread.start()
+
+            self.assertEqual(b'r0,r1,r2:query', response('/fetch'))
+
+            thread.join()
+
+        loop = loops[-1]
+
+        self.assertEqual(b'awaited', response('/awaitable'))
+
+        background.stop()
+
+        self.assertIsNone(background.loop)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+
+        self.assertEqual(b'r0,r1,r2:query', response('/fetch'))
+        self.assertIsNot(loop, loops[-1])
+
+        thread.join()
+        loops.clear()
+
+    def test_metrics(self):
+        def response(path_info: str):
+            environ['PATH_INFO'] = path_info
+
+            return b''.join(app(environ, start_response))
+
+        urlmap = Map((
+            Rule('/<name>', 'page'),
+            Endpoint('page', dummy_page),
+            Rule('/status/<int:code>', 'status'),
+            Endpoint('status', dummy_status),
+        ))
+
+        self.assertIsNone(Service(urlmap).metrics)
+
+        app = Service(urlmap, metrics=True)
+
+        for path_info in ('/one', '/three', '/status/404', '/missing/page'):
+            response(path_info)
+
+        snapshot = app.metrics.snapshot()
+
+        self.assertEqual(1, snapshot['not_found'])
+        self.assertDictEqual({'200': 2}, snapshot['links']['page']['status'])
+        self.assertDictEqual({'404': 1}, snapshot['links']['status']['status'])
+        self.assertEqual(8, snapshot['links']['page']['size']['sum'])
+
+        for name in ('routing', 'handler', 'response'):
+            self.assertEqual(2, snapshot['links']['page'][name]['count'])
+            self.assertLessEqual(0, snapshot['links']['page'][name]['sum'])
+
+        metrics = Metrics()
+
+        self.assertIs(metrics, Service(urlmap, metrics=metrics).metrics)
+
+    def test_metrics_wrapper(self):
+        app = Service(Map((
+            Rule('/<filename>', 'file', {'filename': (0, r'[a-z.]+')}),
+            Endpoint('file', dummy_file),
+        )), metrics=True)
+
+        environ.update({'PATH_INFO': '/file.txt', 'wsgi.file_wrapper': FileWrapper})
+
+        try:
+            body = app(environ, start_response)
+
+            self.assertIsInstance(body, FileWrapper)
+            self.assertEqual(1, app.metrics.snapshot()['links']['file']['count'])
+            self.assertEqual(
+                os.path.getsize(os.path.join(os.path.dirname(__file__), '..', 'static', 'file.txt')),
+                app.metrics.snapshot()['links']['file']['size']['sum'],
+            )
+
+            body.close()
+
+        finally:
+            del environ['wsgi.file_wrapper']
+
     def test_endpoint(self):
         def endpoint(path_info: str):
             environ['PATH_INFO'] = path_info
@@ -362,6 +819,7 @@ class TestModule(Response):
         self.dummy_not_found(Service(not_found=DummyNotFound))
         self.dummy_not_found(Service(not_found=(DummyNotFound,)))
         self.dummy_not_found(Service(not_found=(DummyNotFound, 'dummy_not_found')))
+        self.dummy_not_found(Service(not_found=dummy_async_not_found))
 
     def dummy_not_found(self, app: Service):
         self.assertEqual(b'Dummy Not Found', b''.join(app(environ, start_response)))
@@ -376,12 +834,21 @@ class TestModule(Response):
 
 
 def service_tests():
+    from .test_asgi import asgi_tests
     from .test_http import http_tests
     from .test_static import static_tests
 
     suite = unittest.TestSuite()
     suite.addTests(http_tests())
     suite.addTests(static_tests())
+    suite.addTests(service_cases())
+    suite.addTests(asgi_tests())
+
+    return suite
+
+
+def service_cases():
+    suite = unittest.TestSuite()
 
     for test in (
             'test_status',
@@ -389,6 +856,15 @@ def service_tests():
             'test_args',
             'test_path',
             'test_token',
+            'test_radix',
+            'test_cache',
+            'test_eager',
+            'test_compress',
+            'test_concurrent',
+            'test_context',
+            'test_coroutine',
+            'test_metrics',
+            'test_metrics_wrapper',
             'test_endpoint',
             'test_file',
             'test_redirect',
@@ -0,0 +1,254 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextvars import copy_context
+from unittest import mock
+
+from framework.routing import Rule, Endpoint, Map, Path
+from framework.service.asgi import AsyncService, environ_from
+from framework.service.http import status
+from framework.utils.alias import StartResponse, WSGIEnvironment
+
+
+def scope_from(environ: WSGIEnvironment):
+    headers = [
+        (name[5:].lower().replace('_', '-').encode('latin-1'), value.encode('latin-1'))
+        for name, value in environ.items() if name.startswith('HTTP_')
+    ]
+
+    for name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+        if name in environ:
+            headers.append((name.lower().replace('_', '-').encode('latin-1'), environ[name].encode('latin-1')))
+
+    return {
+        'type': 'http',
+        'method': environ.get('REQUEST_METHOD', 'GET'),
+        'path': environ.get('PATH_INFO', '/'),
+        'query_string': environ.get('QUERY_STRING', '').encode('latin-1'),
+        'headers': headers,
+    }
+
+
+async def run(app: AsyncService, scope: dict, body: bytes = b'', size: int = 65536):
+    messages, chunks = list(), [body[i:i + size] for i in range(0, len(body), size)] or [b'']
+
+    async def receive():
+        if chunks:
+            return {'type': 'http.request', 'body': chunks.pop(0), 'more_body': 0 < len(chunks)}
+
+        return {'type': 'http.disconnect'}
+
+    async def send(message: dict):
+        messages.append(message)
+
+    await AsyncService.__call__(app, scope, receive, send)
+
+    return messages, copy_context()
+
+
+class Bridge(AsyncService):
+    def __call__(self, environ: WSGIEnvironment, start_response: StartResponse):
+        body = environ['wsgi.input'].read() if 'wsgi.input' in environ else b''
+
+        messages, context = asyncio.run(run(self, scope_from(environ), body))
+
+        for variable, value in context.items():
+            variable.set(value)
+
+        start_response(status(messages[0]['status']), [
+            (name.decode('latin-1'), value.decode('latin-1')) for name, value in messages[0]['headers']
+        ])
+
+        return [message['body'] for message in messages[1:] if message['body']]
+
+
+def dummy_async_page(path: Path):
+    async def page():
+        await asyncio.sleep(0)
+
+        return f"async {path['name']}"
+
+    return page()
+
+
+async def dummy_coroutine(path: Path):
+    await asyncio.sleep(0)
+
+    return {'name': path['name']}
+
+
+class TestModule(unittest.TestCase):
+    def test_environ(self):
+        environ = environ_from({
+            'type': 'http',
+            'method': 'POST',
+            'path': '/path',
+            'query_string': b'a=1',
+            'headers': [(b'content-type', b'text/plain'), (b'x-many', b'1'), (b'x-many', b'2')],
+            'server': ('example.org', 8080),
+            'client': ('127.0.0.1', 5000),
+        })
+
+        for key, value in (
+                ('REQUEST_METHOD', 'POST'),
+                ('PATH_INFO', '/path'),
+                ('QUERY_STRING', 'a=1'),
+                ('CONTENT_TYPE', 'text/plain'),
+                ('HTTP_X_MANY', '1,2'),
+                ('SERVER_NAME', 'example.org'),
+                ('SERVER_PORT', '8080'),
+                ('REMOTE_ADDR', '127.0.0.1'),
+        ):
+            self.assertEqual(value, environ[key])
+
+    def test_async(self):
+        app = AsyncService(Map((
+            Rule('/page/<name>', 'page'),
+            Endpoint('page', dummy_async_page),
+            Rule('/coroutine/<name>', 'coroutine'),
+            Endpoint('coroutine', dummy_coroutine),
+        )))
+
+        messages, _ = asyncio.run(run(app, scope_from(dict(PATH_INFO='/page/one'))))
+
+        self.assertEqual(200, messages[0]['status'])
+        self.assertListEqual([{'type': 'http.response.body', 'body': b'async one', 'more_body': False}], messages[1:])
+
+        messages, _ = asyncio.run(run(app, scope_from(dict(PATH_INFO='/coroutine/two'))))
+
+        self.assertIn((b'content-type', b'application/json'), messages[0]['headers'])
+        self.assertEqual(b'{"name":"two"}', messages[1]['body'])
+
+        messages, _ = asyncio.run(run(app, scope_from(dict(PATH_INFO='/page/one', REQUEST_METHOD='HEAD'))))
+
+        self.assertIn((b'content-length', b'9'), messages[0]['headers'])
+        self.assertListEqual([{'type': 'http.response.body', 'body': b'', 'more_body': False}], messages[1:])
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        with open(filepath := os.path.join(directory, 'data.bin'), 'wb') as f:
+            f.write(data := os.urandom(100000))
+
+        app = AsyncService(Map((
+            Rule('/file', 'file'),
+            Endpoint('file', dummy_data, filepath),
+        )), file_buffer_size=16384)
+
+        messages, _ = asyncio.run(run(app, scope_from(dict(PATH_INFO='/file'))))
+
+        self.assertEqual(200, messages[0]['status'])
+        self.assertEqual(data, b''.join(message['body'] for message in messages[1:]))
+        self.assertEqual(7, len(messages[1:]))
+        self.assertFalse(messages[-1]['more_body'])
+
+    def test_body(self):
+        app = AsyncService(Map((
+            Rule('/upload', 'upload'),
+            Endpoint('upload', dummy_upload),
+        )), max_body_size=100000, form_spool=1024)
+
+        scope = scope_from(dict(PATH_INFO='/upload', REQUEST_METHOD='POST'))
+
+        messages, _ = asyncio.run(run(app, scope, b'x' * 50000, 4096))
+
+        self.assertEqual(b'50000', messages[1]['body'])
+
+        messages, _ = asyncio.run(run(app, scope, b'x' * 100001, 4096))
+
+        self.assertEqual(413, messages[0]['status'])
+
+        received, sent = list(), list()
+
+        async def receive():
+            received.append(True)
+
+            return {'type': 'http.request', 'body': b'x' * 4096, 'more_body': True}
+
+        async def send(message: dict):
+            sent.append(message)
+
+        scope = scope_from(dict(PATH_INFO='/upload', REQUEST_METHOD='POST', CONTENT_LENGTH='200000'))
+
+        asyncio.run(app(scope, receive, send))
+
+        self.assertEqual(413, sent[0]['status'])
+        self.assertListEqual([], received)
+
+    def test_lifespan(self):
+        messages, sent = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}], list()
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message: dict):
+            sent.append(message['type'])
+
+        asyncio.run(AsyncService()({'type': 'lifespan'}, receive, send))
+
+        self.assertListEqual(['lifespan.startup.complete', 'lifespan.shutdown.complete'], sent)
+
+
+def dummy_data(filepath: str):
+    from framework.http import file
+
+    return file(filepath)
+
+
+def dummy_upload():
+    from framework.http import body
+
+    return str(len(body().read()))
+
+
+def bridged(module: str, tests: unittest.TestSuite, exclude: tuple[str, ...]):
+    suite = unittest.TestSuite()
+
+    for test in tests:
+        if test._testMethodName in exclude:
+            continue
+
+        class Case(type(test)):
+            def setUp(self):
+                patcher = mock.patch.object(sys.modules[module], 'Service', Bridge)
+                patcher.start()
+
+                self.addCleanup(patcher.stop)
+
+        Case.__name__ = Case.__qualname__ = f"Asgi{type(test).__name__}"
+
+        suite.addTest(Case(test._testMethodName))
+
+    return suite
+
+
+def asgi_tests():
+    from . import service_cases
+    from ..test_http.test_response import response_tests
+    from ..test_wrapper.test_request import request_tests
+    from ..test_wrapper.test_response import response_tests as wrapper_response_tests
+
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_environ',
+            'test_async',
+            'test_file',
+            'test_body',
+            'test_lifespan',
+    ):
+        suite.addTest(TestModule(test))
+
+    for module, tests, exclude in (
+            ('tests.test_service', service_cases(), ('test_file', 'test_environ', 'test_metrics_wrapper')),
+            ('tests.test_http.test_response', response_tests(), ('test_file',)),
+            ('tests.test_wrapper.test_request', request_tests(), ()),
+            ('tests.test_wrapper.test_response', wrapper_response_tests(), ('test_file',)),
+    ):
+        suite.addTests(bridged(module, tests, exclude))
+
+    return suite
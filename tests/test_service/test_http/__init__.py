@@ -1,20 +1,31 @@
 import io
 import json
 import os
+import socket
+import tempfile
 import unittest
+from wsgiref.util import FileWrapper
 
-from framework.service.http import header, Http, File, Route
+from framework.service import http
+from framework.service.http import header, Http, File, Route, Stream
 
 from ... import DummyStartResponse
 
+
+def filepath(filename: str):
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'static', filename))
+
 start_response, status_codes = DummyStartResponse(), (
     ('200 OK', None),
     ('200 OK', 200),
+    ('206 Partial Content', 206),
     ('301 Moved Permanently', 301),
     ('302 Moved Temporarily', 302),
+    ('304 Not Modified', 304),
     ('307 Temporary Redirect', 307),
     ('308 Permanent Redirect', 308),
     ('404 Not Found', 404),
+    ('416 Range Not Satisfiable', 416),
     ('500 Internal Server Error', 500),
     ('520 Unknown Error', 520),
     ('520 Unknown Error', 999),
@@ -56,9 +67,6 @@ class TestModule(Response):
             self.assertEqual(status, response_status())
 
     def test_file(self):
-        def filepath(filename: str):
-            return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'static', filename))
-
         app = File(filepath('file.css'))
 
         self.assertEqual(b'* {\r\n    margin: 0;\r\n    padding: 0;\r\n}', b''.join(app(start_response)))
@@ -77,6 +85,228 @@ class TestModule(Response):
         with self.assertRaises(FileNotFoundError):
             File(filepath('file.error'))
 
+    def test_file_wrapper(self):
+        setattr(http, 'environ', {'wsgi.file_wrapper': FileWrapper})
+
+        try:
+            body = File(filepath('file.txt'))(start_response)
+
+            self.assertIsInstance(body, FileWrapper)
+            self.assertEqual(getattr(File, 'buffer_size'), body.blksize)
+            self.assertEqual(b'simple text', b''.join(body))
+            self.start_response(start_response, '11', 'text/plain; charset=utf-8')
+
+            body.close()
+
+        finally:
+            setattr(http, 'environ', dict())
+
+    def test_sendfile(self):
+        def dummy_start_response(*args):
+            start_response(*args)
+
+            return written.append
+
+        written, (left, right) = list(), socket.socketpair()
+
+        setattr(http, 'environ', {'test.socket': left})
+        setattr(File, 'socket', 'test.socket')
+
+        try:
+            self.assertTupleEqual((), File(filepath('file.txt'))(dummy_start_response))
+            self.assertListEqual([b''], written)
+            self.assertEqual(b'simple text', right.recv(64))
+            self.start_response(start_response, '11', 'text/plain; charset=utf-8')
+
+            setattr(http, 'environ', {'test.socket': left, 'REQUEST_METHOD': 'HEAD'})
+
+            self.assertTupleEqual((), File(filepath('file.txt'))(dummy_start_response))
+            self.assertListEqual([b''], written)
+            self.start_response(start_response, '11', 'text/plain; charset=utf-8')
+
+            right.setblocking(False)
+
+            with self.assertRaises(BlockingIOError):
+                right.recv(64)
+
+        finally:
+            setattr(File, 'socket', None)
+            setattr(http, 'environ', dict())
+
+            left.close()
+            right.close()
+
+    def test_sendfile_partial(self):
+        def dummy_start_response(*args):
+            start_response(*args)
+
+            return written.append
+
+        written, (left, right) = list(), socket.socketpair()
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data := os.urandom(4194304))
+
+        left.setblocking(False)
+        right.setblocking(False)
+
+        setattr(http, 'environ', {'test.socket': left})
+        setattr(File, 'socket', 'test.socket')
+
+        try:
+            rest, received = File(f.name)(dummy_start_response), bytearray()
+
+            while True:
+                try:
+                    if not (chunk := right.recv(65536)):
+                        break
+
+                    received.extend(chunk)
+
+                except BlockingIOError:
+                    break
+
+            self.assertLess(len(received), len(data))
+            self.assertEqual(data, bytes(received) + b''.join(rest))
+
+            right.close()
+
+            with self.assertRaises(OSError):
+                File(f.name)(dummy_start_response)
+
+        finally:
+            setattr(File, 'socket', None)
+            setattr(http, 'environ', dict())
+
+            left.close()
+            right.close()
+            os.unlink(f.name)
+
+    def test_range(self):
+        def response(value: str, if_range: str = None):
+            environ = {'HTTP_RANGE': value}
+
+            if if_range is not None:
+                environ['HTTP_IF_RANGE'] = if_range
+
+            setattr(http, 'environ', environ)
+
+            return b''.join(File(filepath('file.txt'))(start_response)), dict(start_response.headers)
+
+        try:
+            for value, model in (
+                    ('bytes=0-5', b'simple'),
+                    ('bytes=-4', b'text'),
+                    ('bytes=7-', b'text'),
+                    ('bytes=7-100', b'text'),
+            ):
+                body, headers = response(value)
+
+                self.assertEqual(model, body)
+                self.assertEqual('206 Partial Content', start_response.status)
+                self.assertEqual(str(len(model)), headers['content-length'])
+                self.assertEqual(f"bytes {11 - len(model) if '0' != value[6] else 0}-"
+                                 f"{5 if '0' == value[6] else 10}/11", headers['content-range'])
+
+            body, headers = response('bytes=0-5,7-')
+            boundary = headers['content-type'].split('boundary=')[1]
+
+            self.assertEqual('206 Partial Content', start_response.status)
+            self.assertEqual(str(len(body)), headers['content-length'])
+            self.assertEqual(
+                f"--{boundary}\r\ncontent-type: text/plain; charset=utf-8\r\ncontent-range: bytes 0-5/11\r\n\r\n"
+                f"simple\r\n"
+                f"--{boundary}\r\ncontent-type: text/plain; charset=utf-8\r\ncontent-range: bytes 7-10/11\r\n\r\n"
+                f"text\r\n--{boundary}--\r\n".encode('ascii'),
+                body,
+            )
+
+            body, headers = response('bytes=20-')
+
+            self.assertEqual((b'', '416 Range Not Satisfiable'), (body, start_response.status))
+            self.assertEqual('bytes */11', headers['content-range'])
+
+            for value, if_range in (
+                    ('items=0-5', None),
+                    ('bytes=5-0', None),
+                    ('bytes=\xb2-', None),
+                    (f"bytes={','.join(['0-'] * 1000)}", None),
+                    ('bytes=0-5', 'Thu, 01 Jan 1970 00:00:00 GMT'),
+                    ('bytes=0-5', '"etag"'),
+            ):
+                body, headers = response(value, if_range)
+
+                self.assertEqual((b'simple text', '200 OK'), (body, start_response.status))
+                self.assertEqual('bytes', headers['accept-ranges'])
+
+            body, _ = response('bytes=0-5', File(filepath('file.txt')).stat.last_modified)
+
+            self.assertEqual((b'simple', '206 Partial Content'), (body, start_response.status))
+
+        finally:
+            setattr(http, 'environ', dict())
+
+    def test_conditional(self):
+        def response(app: File | Route, **kwargs: str):
+            setattr(http, 'environ', kwargs)
+
+            return b''.join(app(start_response)), dict(start_response.headers)
+
+        try:
+            body, headers = response(File(filepath('file.txt')))
+            etag, last_modified = headers['etag'], headers['last-modified']
+
+            self.assertEqual((b'simple text', '200 OK'), (body, start_response.status))
+            self.assertEqual(File(filepath('file.txt')).stat.last_modified, last_modified)
+
+            for kwargs in (
+                    {'HTTP_IF_NONE_MATCH': etag},
+                    {'HTTP_IF_NONE_MATCH': f'"other", W/{etag}'},
+                    {'HTTP_IF_NONE_MATCH': '*'},
+                    {'HTTP_IF_MODIFIED_SINCE': last_modified},
+                    {'HTTP_IF_MODIFIED_SINCE': 'Fri, 01 Jan 2100 00:00:00 GMT'},
+            ):
+                body, headers = response(File(filepath('file.txt')), **kwargs)
+
+                self.assertEqual((b'', '304 Not Modified'), (body, start_response.status))
+                self.assertEqual(etag, headers['etag'])
+                self.assertNotIn('content-length', headers)
+
+            for kwargs in (
+                    {'HTTP_IF_NONE_MATCH': '"other"'},
+                    {'HTTP_IF_NONE_MATCH': '"other"', 'HTTP_IF_MODIFIED_SINCE': last_modified},
+                    {'HTTP_IF_MODIFIED_SINCE': 'Thu, 01 Jan 1970 00:00:00 GMT'},
+                    {'HTTP_IF_MODIFIED_SINCE': 'invalid date'},
+                    {'HTTP_IF_NONE_MATCH': etag, 'REQUEST_METHOD': 'POST'},
+            ):
+                self.assertEqual(b'simple text', response(File(filepath('file.txt')), **kwargs)[0])
+                self.assertEqual('200 OK', start_response.status)
+
+            body, _ = response(File(filepath('file.txt')), HTTP_RANGE='bytes=7-', HTTP_IF_RANGE=etag)
+
+            self.assertEqual((b'text', '206 Partial Content'), (body, start_response.status))
+
+            self.assertNotIn('etag', response(Route(b'body'))[1])
+
+            setattr(Route, 'checksum', True)
+
+            body, headers = response(Route(b'body'))
+
+            self.assertEqual(b'body', body)
+            self.assertEqual(34, len(etag := headers['etag']))
+            self.assertEqual(b'', response(Route(b'body'), HTTP_IF_NONE_MATCH=etag)[0])
+            self.assertEqual('304 Not Modified', start_response.status)
+            self.assertEqual(b'moved', response(Route(b'moved', 301), HTTP_IF_NONE_MATCH=etag)[0])
+
+            setattr(Route, 'checksum', False)
+
+            self.assertEqual(b'', response(Route(b'body', None, [('etag', '"v1"')]), HTTP_IF_NONE_MATCH='"v1"')[0])
+            self.assertEqual('304 Not Modified', start_response.status)
+
+        finally:
+            setattr(Route, 'checksum', False)
+            setattr(http, 'environ', dict())
+
     def test_body(self):
         app = Route(1)
 
@@ -93,6 +323,46 @@ class TestModule(Response):
         self.assertEqual(b"class 'bytes'", b''.join(app(start_response)))
         self.start_response(start_response, '13', 'text/plain; charset=utf-8')
 
+        body = b'x' * (Http.buffer_size * 3 + 1)
+
+        self.assertListEqual([body], list(Route(body)(start_response)))
+        self.assertIs(body, next(Route(body)(start_response)))
+
+    def test_stream(self):
+        closed = list()
+
+        def chunks():
+            try:
+                yield 'one '
+                yield b''
+                yield b'two'
+
+            finally:
+                closed.append(True)
+
+        app = Stream(chunks())
+
+        self.assertEqual(b'one two', b''.join(app(start_response)))
+        self.assertEqual('200 OK', start_response.status)
+        self.assertNotIn('content-length', dict(start_response.headers))
+        self.assertEqual('text/plain; charset=utf-8', dict(start_response.headers)['content-type'])
+        self.assertListEqual([True], closed)
+
+        body = Stream(chunks(), 404, [('x-stream', 'yes')], 'text/csv', 'ascii', 7)(start_response)
+
+        self.assertEqual(b'one ', next(body))
+        self.assertEqual('404 Not Found', start_response.status)
+        self.assertEqual('7', dict(start_response.headers)['content-length'])
+        self.assertEqual('text/csv; charset=ascii', dict(start_response.headers)['content-type'])
+
+        body.close()
+
+        self.assertListEqual([True, True], closed)
+        self.assertEqual('yes', dict(start_response.headers)['x-stream'])
+
+        self.assertEqual(b'ab', b''.join(Stream(iter((b'a', 'b')), mimetype='application/json')(start_response)))
+        self.assertEqual('application/json', dict(start_response.headers)['content-type'])
+
     def test_header(self):
         tuple(Route(
             b'', None, [('name', 'header value'), ('location', '/response.redirect')]
@@ -139,7 +409,13 @@ def http_tests():
     for test in (
             'test_status',
             'test_file',
+            'test_file_wrapper',
+            'test_sendfile',
+            'test_sendfile_partial',
+            'test_range',
+            'test_conditional',
             'test_body',
+            'test_stream',
             'test_header',
             'test_mimetype',
     ):
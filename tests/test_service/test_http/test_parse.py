@@ -1,6 +1,15 @@
+import io
+import tempfile
 import unittest
+from unittest import mock
 
-from framework.service.http.parse import Query, Cookie
+from framework.service.http.parse import accepts, byteranges, Query, Cookie, EnvironParse
+from framework.service.http.parse import Body, Form, RequestError, Upload
+
+
+class DummyInput(io.BytesIO):
+    def read(self, size: int = -1):
+        return super().read(7 if size < 0 else min(7, size))
 
 
 class TestModule(unittest.TestCase):
@@ -22,6 +31,233 @@ class TestModule(unittest.TestCase):
 
         self.assertDictEqual({'one': 'one cookie', 'two': 'two cookie'}, Cookie(environ))
 
+    def test_byteranges(self):
+        for value, model in (
+                ('bytes=0-0', [(0, 0)]),
+                ('bytes=0-99', [(0, 99)]),
+                ('bytes=0-500', [(0, 99)]),
+                ('bytes=90-', [(90, 99)]),
+                ('bytes=-10', [(90, 99)]),
+                ('bytes=-500', [(0, 99)]),
+                ('bytes=0-9, 20-29,-5', [(0, 9), (20, 29), (95, 99)]),
+                ('bytes=100-', []),
+                ('bytes=-0', []),
+                ('bytes=5-1', None),
+                ('bytes=-', None),
+                ('bytes=a-b', None),
+                ('bytes=0-1-2', None),
+                ('bytes=\xb2-', None),
+                ('bytes=0-\u0661', None),
+                ('lines=0-1', None),
+                ('bytes=0-9,5-19,20-29', [(0, 29)]),
+                ('bytes=50-59,-5,0-9', [(0, 9), (50, 59), (95, 99)]),
+                ('bytes=0-,0-,0-', [(0, 99)]),
+                (f"bytes={','.join(['0-'] * 101)}", None),
+        ):
+            self.assertEqual(model, byteranges(value, 100))
+
+        self.assertListEqual([], byteranges('bytes=-5', 0))
+
+    def test_accepts(self):
+        for value, model in (
+                (None, False),
+                ('', False),
+                ('gzip', True),
+                ('GZIP', True),
+                ('deflate, gzip;q=0.5', True),
+                ('gzip;q=0', False),
+                ('br', False),
+                ('*', True),
+                ('*;q=0', False),
+                ('gzip;q=0, *', False),
+                ('*, gzip;q=0', False),
+                ('gzip;q=x', False),
+        ):
+            self.assertEqual(model, accepts(value, 'gzip'))
+
+    def test_body(self):
+        def environ(body: bytes, length: str | None, **kwargs):
+            kwargs['wsgi.input'] = io.BytesIO(body)
+
+            if length is not None:
+                kwargs['CONTENT_LENGTH'] = length
+
+            return kwargs
+
+        self.assertEqual(b'', Body(environ(b'ignored', None)).read())
+        self.assertEqual(b'', Body(environ(b'ignored', '')).read())
+        self.assertEqual(b'', Body(dict()).read())
+        self.assertEqual(b'body', Body(environ(b'body and more', '4')).read())
+
+        body = Body(environ(b'0123456789', '10'))
+
+        self.assertEqual(b'012', body.read(3))
+        self.assertListEqual([b'3456', b'789'], list(body.chunks(4)))
+        self.assertEqual(b'', body.read())
+
+        body, buffer = Body(environ(b'0123456789', '6')), bytearray(4)
+
+        self.assertEqual(4, body.readinto(buffer))
+        self.assertEqual(b'0123', buffer)
+        self.assertEqual(2, body.readinto(buffer))
+        self.assertEqual(b'4523', buffer)
+        self.assertEqual(0, body.readinto(buffer))
+
+        body = Body(environ(b'0123456789', None, **{'wsgi.input_terminated': True}))
+
+        self.assertEqual(b'0123456789', body.read())
+
+        try:
+            Body.limit = 8
+
+            self.assertEqual(b'01234567', Body(environ(b'01234567', '8')).read())
+
+            for length, kwargs, code in (
+                    ('9', {}, 413),
+                    ('-1', {}, 400),
+                    ('x', {}, 400),
+                    ('\xb2', {}, 400),
+                    ('\u0661', {}, 400),
+                    (None, {'HTTP_TRANSFER_ENCODING': 'chunked'}, 411),
+            ):
+                with self.assertRaises(RequestError) as context:
+                    Body(environ(b'', length, **kwargs))
+
+                self.assertEqual(code, context.exception.code)
+
+            body = Body(environ(b'0123456789', None, **{'wsgi.input_terminated': True}))
+
+            self.assertEqual(b'0123', body.read(4))
+
+            with self.assertRaises(RequestError) as context:
+                body.read()
+
+            self.assertEqual(413, context.exception.code)
+
+        finally:
+            Body.limit = None
+
+    def test_form(self):
+        def environ(body: bytes, mimetype: str):
+            return {'CONTENT_TYPE': mimetype, 'CONTENT_LENGTH': str(len(body)), 'wsgi.input': DummyInput(body)}
+
+        def form(body: bytes, mimetype: str):
+            return Form(e := environ(body, mimetype), Body(e))
+
+        multipart = (
+            b'preamble\r\n'
+            b'--xyz\r\n'
+            b'content-disposition: form-data; name="title"\r\n\r\n'
+            b'caf\xc3\xa9 --xy\r\n'
+            b'--xyz\r\n'
+            b'content-disposition: form-data; name="upload"; filename="a \\"b\\".txt"\r\n'
+            b'content-type: application/octet-stream\r\n\r\n'
+            + bytes(range(256)) * 4 +
+            b'\r\n--xyz--\r\n'
+            b'epilogue'
+        )
+
+        self.assertDictEqual({}, form(b'one=1', 'text/plain'))
+        self.assertDictEqual(
+            {'one': 'one value', 'two': '', 'three': '&=', 'four': '4'},
+            form(b'one=one+value&two&three=%26%3D&&four=4', 'application/x-www-form-urlencoded'),
+        )
+
+        self.assertDictEqual(
+            {'name': 'café', 'city': 'Zürich'},
+            form('name=café&city=Z%C3%BCrich'.encode(), 'application/x-www-form-urlencoded'),
+        )
+        self.assertDictEqual(
+            {'name': 'café'},
+            form('name=café'.encode('latin-1'), 'application/x-www-form-urlencoded; charset=latin-1'),
+        )
+
+        with self.assertRaises(RequestError) as context:
+            form(b'one=1', 'application/x-www-form-urlencoded; charset=unknown')
+
+        self.assertEqual(400, context.exception.code)
+
+        result = form(multipart, 'multipart/form-data; boundary="xyz"')
+
+        self.assertDictEqual({'title': 'café --xy'}, result)
+        self.assertListEqual(['upload'], list(result.files))
+
+        upload = result.files['upload']
+
+        self.assertIsInstance(upload, Upload)
+        self.assertEqual(('a "b".txt', 'application/octet-stream', 1024), (upload.filename, upload.mimetype, upload.size))
+        self.assertEqual(bytes(range(256)) * 4, upload.file.read())
+
+        try:
+            Form.spool = 100
+
+            self.assertTrue(getattr(form(multipart, 'multipart/form-data; boundary=xyz').files['upload'].file, '_rolled'))
+
+            Form.part_limit = 1000
+
+            self.assertEqual('1' * 996, form(b'one=' + b'1' * 996, 'application/x-www-form-urlencoded')['one'])
+
+            for body, mimetype, code in (
+                    (multipart, 'multipart/form-data; boundary=xyz', 413),
+                    (b'one=' + b'1' * 997, 'application/x-www-form-urlencoded', 413),
+                    (multipart, 'multipart/form-data', 400),
+                    (multipart[:80], 'multipart/form-data; boundary=xyz', 400),
+                    (b'--xyz\r\ncontent-type: text/plain\r\n\r\n\r\n--xyz--', 'multipart/form-data; boundary=xyz', 400),
+            ):
+                with self.assertRaises(RequestError) as context:
+                    form(body, mimetype)
+
+                self.assertEqual(code, context.exception.code)
+
+            created, spooled = list(), tempfile.SpooledTemporaryFile
+
+            def spool(**kwargs):
+                created.append(f := spooled(**kwargs))
+
+                return f
+
+            with mock.patch('tempfile.SpooledTemporaryFile', side_effect=spool):
+                for body, code in (
+                        (multipart, 413),
+                        (multipart.replace(b'--xyz--', b'--xyz\r\nbroken'), 400),
+                ):
+                    with self.assertRaises(RequestError) as context:
+                        form(body, 'multipart/form-data; boundary=xyz')
+
+                    self.assertEqual(code, context.exception.code)
+
+                    Form.part_limit = None
+
+            self.assertEqual(2, len(created))
+            self.assertTrue(all(f.closed for f in created))
+
+            Form.part_limit, Form.limit = None, 100
+
+            with self.assertRaises(RequestError) as context:
+                form(multipart, 'multipart/form-data; boundary=xyz')
+
+            self.assertEqual(413, context.exception.code)
+
+        finally:
+            Form.spool, Form.part_limit, Form.limit = 1048576, None, None
+
+    def test_lazy(self):
+        environ = dict(HTTP_COOKIE='one=one cookie')
+
+        call = EnvironParse(environ)
+
+        self.assertIsNone(getattr(call, '_EnvironParse__query'))
+        self.assertIsNone(getattr(call, '_EnvironParse__cookie'))
+
+        self.assertDictEqual({'one': 'one cookie'}, call.cookie)
+        self.assertIs(call.cookie, call.cookie)
+        self.assertIsNone(getattr(call, '_EnvironParse__query'))
+
+        environ['QUERY_STRING'] = 'one=one%20query'
+
+        self.assertDictEqual({'one': 'one query'}, call.query)
+        self.assertIs(call.query, call.query)
+
 
 def parse_tests():
     suite = unittest.TestSuite()
@@ -29,6 +265,11 @@ def parse_tests():
     for test in (
             'test_query',
             'test_cookie',
+            'test_byteranges',
+            'test_accepts',
+            'test_body',
+            'test_form',
+            'test_lazy',
     ):
         suite.addTest(TestModule(test))
 
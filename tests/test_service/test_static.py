@@ -1,7 +1,12 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 from framework.routing import Rule, Endpoint, Map, Path
 from framework.service import static, Service
+from framework.service import http
+from framework.service.http import File
 
 from .. import DummyStartResponse
 
@@ -67,6 +72,120 @@ class TestModule(unittest.TestCase):
         self.assertEqual(b'/style.css', response('/'))
         self.assertEqual(b'/\n/link/test.html', response('/link/test.html'))
 
+    def test_lookup(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        filepath = os.path.join(directory, 'file.txt')
+
+        with open(filepath, 'wb') as f:
+            f.write(b'text')
+
+        Service(static_cache=2, static_interval=60)
+
+        stat = static.lookup(filepath)
+
+        self.assertEqual(4, stat.size)
+        self.assertEqual(('text/plain', None), stat.mimetype)
+        self.assertEqual((('etag', stat.etag), ('last-modified', stat.last_modified)), stat.headers)
+        self.assertIs(stat, static.lookup(filepath))
+        self.assertEqual(1, static.files.hits)
+
+        with open(filepath, 'wb') as f:
+            f.write(b'modified')
+
+        self.assertIs(stat, static.lookup(filepath))
+
+        static.interval = 0
+
+        modified = static.lookup(filepath)
+
+        self.assertIsNot(stat, modified)
+        self.assertEqual(8, modified.size)
+        self.assertIs(modified, static.lookup(filepath))
+
+        self.assertIsNone(static.lookup(directory))
+        self.assertIsNone(static.lookup(os.path.join(directory, 'missing.txt')))
+
+        for name in ('file.css', 'file.json'):
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(b'{}')
+
+            static.lookup(os.path.join(directory, name))
+
+        self.assertEqual(2, len(static.files))
+
+        os.remove(filepath)
+
+        self.assertIsNone(static.lookup(filepath))
+
+        Service(static_cache=0)
+
+        self.assertIsNone(static.files)
+        self.assertIsNone(static.lookup(filepath))
+
+    def test_memory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        for name, size in (('small.css', 8), ('large.js', 64), ('medium.js', 80), ('huge.js', 256)):
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(bytes(range(size)))
+
+        Service(static_memory=128, static_preload=64, file_buffer_size=32)
+
+        small = static.lookup(os.path.join(directory, 'small.css'))
+        large = static.lookup(os.path.join(directory, 'large.js'))
+
+        self.assertIsInstance(small.content, bytes)
+        self.assertIsInstance(large.content, bytes)
+        self.assertIsNone(static.lookup(os.path.join(directory, 'medium.js')).content)
+        self.assertIsNone(static.lookup(os.path.join(directory, 'huge.js')).content)
+        self.assertEqual(72, static.memory.used)
+
+        body = File(os.path.join(directory, 'small.css'), small)(start_response)
+
+        self.assertIs(small.content, next(iter(body)))
+
+        body = list(File(os.path.join(directory, 'large.js'), large)(start_response))
+
+        self.assertEqual([bytes(range(64))], body)
+
+        http.environ = dict(REQUEST_METHOD='GET', HTTP_RANGE='bytes=30-33')
+
+        self.assertEqual(b'\x1e\x1f !', b''.join(File(os.path.join(directory, 'large.js'), large)(start_response)))
+        self.assertEqual('206 Partial Content', start_response.status)
+
+        http.environ = dict()
+
+        with open(os.path.join(directory, 'other.css'), 'wb') as f:
+            f.write(bytes(64))
+
+        static.lookup(os.path.join(directory, 'other.css'))
+
+        self.assertIsNone(small.content)
+        self.assertEqual(128, static.memory.used)
+
+        static.interval = 0
+
+        with open(os.path.join(directory, 'large.js'), 'wb') as f:
+            f.write(b'modified')
+
+        modified = static.lookup(os.path.join(directory, 'large.js'))
+
+        self.assertEqual(b'modified', modified.content)
+        self.assertIsNone(large.content)
+        self.assertEqual(72, static.memory.used)
+
+        os.remove(os.path.join(directory, 'other.css'))
+
+        self.assertIsNone(static.lookup(os.path.join(directory, 'other.css')))
+        self.assertEqual(8, static.memory.used)
+
+        Service()
+
+        self.assertIsNone(static.memory)
+
 
 def static_tests():
     suite = unittest.TestSuite()
@@ -74,6 +193,8 @@ def static_tests():
     for test in (
             'test_urlpath',
             'test_link',
+            'test_lookup',
+            'test_memory',
     ):
         suite.addTest(TestModule(test))
 
@@ -2,9 +2,17 @@ import unittest
 
 
 def utils_tests():
+    from .test_context import context_tests
+    from .test_lru import lru_tests
+    from .test_metrics import metrics_tests
+    from .test_serialize import serialize_tests
     from .test_utc import utc_tests
 
     suite = unittest.TestSuite()
+    suite.addTests(context_tests())
+    suite.addTests(lru_tests())
+    suite.addTests(metrics_tests())
+    suite.addTests(serialize_tests())
     suite.addTests(utc_tests())
 
     return suite
@@ -0,0 +1,85 @@
+import sys
+import threading
+import types
+import unittest
+from contextvars import Context, ContextVar, copy_context
+
+from framework.utils.context import contextual, restore, Closing
+
+
+class TestModule(unittest.TestCase):
+    def test_contextual(self):
+        sys.modules['dummy_context'] = module = types.ModuleType('dummy_context')
+        self.addCleanup(sys.modules.pop, 'dummy_context')
+
+        module.value, module.other = 'global', 'kept'
+
+        contextual('dummy_context', value=ContextVar('value'), default=ContextVar('default', default=0))
+
+        self.assertFalse(hasattr(module, 'value'))
+        self.assertEqual(0, module.default)
+        self.assertEqual('kept', module.other)
+
+        with self.assertRaises(AttributeError):
+            getattr(module, 'value')
+
+        def request(name: str):
+            setattr(module, 'value', name)
+
+            barrier.wait()
+
+            results[name] = module.value
+
+        barrier, results = threading.Barrier(4), dict()
+
+        threads = [threading.Thread(target=request, args=(str(i),)) for i in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertDictEqual({str(i): str(i) for i in range(4)}, results)
+        self.assertFalse(hasattr(module, 'value'))
+
+        copy_context().run(setattr, module, 'value', 'copied')
+
+        self.assertFalse(hasattr(module, 'value'))
+
+    def test_closing(self):
+        def run():
+            tokens = (variable.set('request'),)
+
+            closing = Closing(iter((b'one', b'two')), tokens)
+
+            self.assertEqual([b'one', b'two'], list(closing))
+            self.assertEqual('request', variable.get())
+
+            closing.close()
+
+            return variable.get()
+
+        variable = ContextVar('closing', default='idle')
+
+        self.assertEqual('idle', Context().run(run))
+
+        tokens = (variable.set('request'),)
+
+        Context().run(restore, tokens)
+        self.assertEqual('request', variable.get())
+
+        restore(tokens)
+        self.assertEqual('idle', variable.get())
+
+
+def context_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_contextual',
+            'test_closing',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
@@ -0,0 +1,59 @@
+import threading
+import unittest
+
+from framework.utils.lru import LRU
+
+
+class TestModule(unittest.TestCase):
+    def test_order(self):
+        lru = LRU(2)
+
+        lru.set('one', 1)
+        lru.set('two', 2)
+
+        self.assertEqual(1, lru.get('one'))
+
+        lru.set('three', 3)
+
+        self.assertIsNone(lru.get('two'))
+        self.assertEqual(1, lru.get('one'))
+        self.assertEqual(3, lru.get('three'))
+        self.assertEqual((3, 1), (lru.hits, lru.misses))
+
+        self.assertEqual(1, lru.pop('one'))
+        self.assertEqual(1, len(lru))
+
+        lru.clear()
+
+        self.assertEqual((0, 0, 0), (len(lru), lru.hits, lru.misses))
+
+    def test_threads(self):
+        def worker(i: int):
+            for n in range(1000):
+                if lru.get(key := (i + n) % 64) is None:
+                    lru.set(key, key)
+
+        lru = LRU(32)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(32, len(lru))
+        self.assertEqual(8000, lru.hits + lru.misses)
+
+
+def lru_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_order',
+            'test_threads',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
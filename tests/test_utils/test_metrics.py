@@ -0,0 +1,92 @@
+import json
+import unittest
+
+from framework.utils.metrics import Histogram, Measure, Measured, Metrics
+
+
+class TestModule(unittest.TestCase):
+    def test_histogram(self):
+        histogram = Histogram((1, 10))
+
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        self.assertDictEqual(
+            {'count': 4, 'sum': 56.5, 'buckets': [[1, 2], [10, 3], ['+Inf', 4]]}, histogram.snapshot()
+        )
+
+    def test_metrics(self):
+        metrics = Metrics()
+
+        for link, status, size in (('index', '200', 10), ('index', '404', 0), (None, None, 0)):
+            measure = Measure()
+            measure.link, measure.status, measure.size = link, status, size
+
+            metrics.observe(measure)
+            metrics.observe(measure)
+
+        snapshot = json.loads(json.dumps(metrics.snapshot()))
+
+        self.assertEqual(1, snapshot['not_found'])
+        self.assertListEqual(['index'], list(snapshot['links']))
+        self.assertEqual(2, snapshot['links']['index']['count'])
+        self.assertDictEqual({'200': 1, '404': 1}, snapshot['links']['index']['status'])
+        self.assertEqual(10, snapshot['links']['index']['size']['sum'])
+
+        for name in ('routing', 'handler', 'response'):
+            self.assertEqual(2, snapshot['links']['index'][name]['count'])
+
+        export = metrics.export()
+
+        self.assertIn('framework_not_found_total 1\n', export)
+        self.assertIn('framework_requests_total{link="index",status="404"} 1\n', export)
+        self.assertIn('framework_size_bytes_bucket{link="index",le="+Inf"} 2\n', export)
+        self.assertIn('framework_handler_seconds_count{link="index"} 2\n', export)
+
+        metrics.reset()
+
+        self.assertDictEqual({'not_found': 0, 'links': {}}, metrics.snapshot())
+
+        measure = Measure()
+        measure.link, measure.status = 'a"b\\c\nd', '200'
+
+        metrics.observe(measure)
+
+        export = metrics.export()
+
+        self.assertIn('framework_requests_total{link="a\\"b\\\\c\\nd",status="200"} 1\n', export)
+        self.assertIn('framework_size_bytes_count{link="a\\"b\\\\c\\nd"} 1\n', export)
+        self.assertTrue(all(line.startswith(('# ', 'framework_')) for line in export.splitlines()))
+
+    def test_measured(self):
+        metrics, measure, closed = Metrics(), Measure(), list()
+
+        class Chunks(list):
+            def close(self):
+                closed.append(True)
+
+        measure.link, measure.status = 'index', '200'
+
+        body = Measured(Chunks([b'one', b'two']), metrics, measure)
+
+        self.assertEqual(b'onetwo', b''.join(body))
+        self.assertEqual(1, metrics.snapshot()['links']['index']['count'])
+
+        body.close()
+
+        self.assertListEqual([True], closed)
+        self.assertEqual(1, metrics.snapshot()['links']['index']['count'])
+        self.assertEqual(6, metrics.snapshot()['links']['index']['size']['sum'])
+
+
+def metrics_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_histogram',
+            'test_metrics',
+            'test_measured',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
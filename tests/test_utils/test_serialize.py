@@ -0,0 +1,92 @@
+import dataclasses
+import datetime
+import enum
+import json
+import math
+import unittest
+import uuid
+
+from framework.utils import serialize
+from framework.utils.serialize import array, dumps
+
+
+class DummyEnum(enum.Enum):
+    one = 'one'
+
+
+@dataclasses.dataclass
+class DummyData(object):
+    rate: float
+    day: datetime.date
+
+
+class TestModule(unittest.TestCase):
+    def test_dumps(self):
+        value = {'one': [1, 2.5, None, True], 'два': 'значение', 3: {}}
+
+        self.assertEqual(
+            '{"one":[1,2.5,null,true],"два":"значение","3":{}}'.encode('utf-8'), dumps(value)
+        )
+
+        orjson, serialize.orjson = serialize.orjson, None
+
+        try:
+            self.assertEqual(
+                '{"one":[1,2.5,null,true],"два":"значение","3":{}}'.encode('utf-8'), dumps(value)
+            )
+
+        finally:
+            serialize.orjson = orjson
+
+    def test_fallback(self):
+        value = {
+            'nan': math.nan,
+            'inf': [math.inf, -math.inf, (1.5,)],
+            'datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, 600, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2024, 1, 2),
+            'uuid': uuid.UUID(int=1),
+            'enum': DummyEnum.one,
+            'dataclass': DummyData(math.nan, datetime.date(2024, 1, 2)),
+        }
+        model = (
+            b'{"nan":null,"inf":[null,null,[1.5]],"datetime":"2024-01-02T03:04:05.000600+00:00","date":"2024-01-02",'
+            b'"uuid":"00000000-0000-0000-0000-000000000001","enum":"one","dataclass":{"rate":null,"day":"2024-01-02"}}'
+        )
+
+        if serialize.orjson is not None:
+            self.assertEqual(model, dumps(value))
+
+        orjson, serialize.orjson = serialize.orjson, None
+
+        try:
+            self.assertEqual(model, dumps(value))
+
+            with self.assertRaises(TypeError):
+                dumps({'set': {1}})
+
+        finally:
+            serialize.orjson = orjson
+
+    def test_array(self):
+        self.assertEqual(b'[]', b''.join(array(())))
+        self.assertEqual(b'[{"id":0}]', b''.join(array({'id': i} for i in range(1))))
+        self.assertListEqual(
+            [{'id': i} for i in range(3)], json.loads(b''.join(array({'id': i} for i in range(3))))
+        )
+
+        chunks = array(iter(range(1000000)))
+
+        self.assertListEqual([b'[', b'0', b',1'], [next(chunks) for _ in range(3)])
+
+
+def serialize_tests():
+    suite = unittest.TestSuite()
+
+    for test in (
+            'test_dumps',
+            'test_fallback',
+            'test_array',
+    ):
+        suite.addTest(TestModule(test))
+
+    return suite
@@ -41,6 +41,9 @@ class DummyMap(Response):
     def dummy_file(self, path: Path):
         return self.file(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static', path['filename'])))
 
+    def dummy_stream(self, path: Path):
+        return self.stream((b'chunk' for _ in range(path['count'])), length=5 * path['count'])
+
     def dummy_redirect(self, path: Path):
         url = self.url_for('dummy', dummy=path['redirect'])
 
@@ -138,6 +141,17 @@ class TestModule(Headers):
         response('/file.txt', b'simple text')
         self.start_response('11', 'text/plain; charset=utf-8')
 
+    def test_stream(self):
+        environ['PATH_INFO'] = '/stream/2'
+
+        app = Service(Map((
+            Rule('/stream/<int:count>', 'stream'),
+            Endpoint('stream', (DummyMap, 'dummy_stream')),
+        )))
+
+        self.assertEqual(b'chunkchunk', b''.join(app(environ, start_response)))
+        self.start_response('10', 'text/plain; charset=utf-8')
+
     def start_response(self, length: str, mimetype: str, status: str = '200 OK'):
         self.file_content(length, mimetype)
 
@@ -199,6 +213,7 @@ def response_tests():
             'test_url_file',
             'test_url_for',
             'test_file',
+            'test_stream',
             'test_redirect',
             'test_headers',
     ):